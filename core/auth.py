@@ -0,0 +1,48 @@
+"""
+Authentication backend that serves the logged-in user from the cache.
+
+AuthenticationMiddleware loads request.user through the session's backend on
+every request. CachedModelBackend answers that lookup from the cache, so with a
+cache-backed session engine an authenticated request reaches its view without
+touching the database. Cached users are dropped whenever a User row is saved or
+deleted (see core.signals), which covers disabling, deleting and password
+changes; Django still checks the session's password hash against the cached user.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import transaction
+
+UserModel = get_user_model()
+
+
+def _user_key(user_id):
+    return f'focus:auth-user:{user_id}'
+
+
+def forget_cached_user(user_id):
+    """Drop a cached user now and again once the current transaction commits"""
+    # The second delete catches a concurrent request that re-cached the old row mid-transaction
+    cache.delete(_user_key(user_id))
+    transaction.on_commit(lambda: cache.delete(_user_key(user_id)))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose per-request get_user() is a cache hit"""
+
+    def get_user(self, user_id):
+        key = _user_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            try:
+                user = UserModel._default_manager.get(pk=user_id)
+            except UserModel.DoesNotExist:
+                return None
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        # Disabled users are cached too, so this runs on every hit
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        return await sync_to_async(self.get_user)(user_id)
@@ -0,0 +1,118 @@
+"""
+Data versions for cached, per-user computed payloads.
+
+Each user has a version token that write endpoints bump after they change the
+user's sessions, assignments or folders. Cached payloads include the token in
+their key, so a bump makes every older entry unreachable and a cache hit is
+always fresh. Global data (the leaderboards) has its own token.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+LEADERBOARD_SCOPE = 'leaderboard'
+
+
+def _version_key(scope):
+    return f'focus:data-version:{scope}'
+
+
+def _new_token():
+    # Time-based so a version lost to eviction never reuses an old token
+    return time.time_ns()
+
+
+def get_version(scope):
+    """Current version token for a scope (a user id or a global name)"""
+    key = _version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_token(), None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_version(scope):
+    """get_version() for async code"""
+    key = _version_key(scope)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, _new_token(), None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_version(scope):
+    """Invalidate cached payloads for a scope once the current transaction commits"""
+    transaction.on_commit(lambda: cache.set(_version_key(scope), _new_token(), None))
+
+
+def get_data_version(user):
+    return get_version(user.pk)
+
+
+async def aget_data_version(user):
+    return await aget_version(user.pk)
+
+
+def bump_data_version(user, leaderboard=False):
+    """Bump a user's version (and the leaderboard's when study time changed)"""
+    bump_version(user.pk)
+    if leaderboard:
+        bump_version(LEADERBOARD_SCOPE)
+
+
+def _payload_key(name, versions):
+    return f"focus:{name}:{':'.join(str(v) for v in versions)}"
+
+
+def cached_payload(name, versions, builder, timeout=None):
+    """
+    Return the payload cached under `name` and the given version tokens,
+    building and storing it with `builder()` on a miss.
+    """
+    key = _payload_key(name, versions)
+    payload = cache.get(key)
+    if payload is None:
+        payload = builder()
+        cache.set(key, payload, settings.DASHBOARD_CACHE_TIMEOUT if timeout is None else timeout)
+    return payload
+
+
+async def acached_payload(name, versions, builder, timeout=None):
+    """cached_payload() for async code; `builder()` returns an awaitable"""
+    key = _payload_key(name, versions)
+    payload = await cache.aget(key)
+    if payload is None:
+        payload = await builder()
+        await cache.aset(key, payload, settings.DASHBOARD_CACHE_TIMEOUT if timeout is None else timeout)
+    return payload
+
+
+# Unresolved support message count for the admin sidebar badge. Signal handlers
+# adjust it as messages change; the timeout makes it recount now and then, which
+# reconciles writes that skip signals (queryset.update(), raw SQL).
+UNRESOLVED_COUNT_KEY = 'focus:unresolved-messages'
+UNRESOLVED_COUNT_TIMEOUT = 300
+
+
+def get_unresolved_message_count():
+    count = cache.get(UNRESOLVED_COUNT_KEY)
+    if count is None:
+        from .models import SupportMessage
+        count = SupportMessage.objects.filter(is_resolved=False).count()
+        cache.set(UNRESOLVED_COUNT_KEY, count, UNRESOLVED_COUNT_TIMEOUT)
+    return max(count, 0)
+
+
+def adjust_unresolved_message_count(delta):
+    """Apply a change to the cached count once the current transaction commits"""
+    def apply():
+        try:
+            cache.incr(UNRESOLVED_COUNT_KEY, delta)
+        except ValueError:
+            # Not cached right now; the next read counts from the database
+            pass
+    transaction.on_commit(apply)
@@ -1,4 +1,4 @@
-from .models import SupportMessage
+from .caching import get_unresolved_message_count
 
 
 def admin_message_count(request):
@@ -9,8 +9,8 @@ def admin_message_count(request):
     context = {}
     
     if request.user.is_authenticated and request.user.is_superuser:
-        # Count unresolved support messages for admin users
-        unresolved_count = SupportMessage.objects.filter(is_resolved=False).count()
+        # Unresolved support messages, counted from cache (see core.signals)
+        unresolved_count = get_unresolved_message_count()
         context['unresolved_message_count'] = unresolved_count if unresolved_count > 0 else None
     
     return context
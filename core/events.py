@@ -0,0 +1,103 @@
+"""
+Live support message events, pushed to browsers over Server-Sent Events.
+
+Views publish to named channels ("user:<id>", "admins") through the configured
+broker. The broker hands events to the Hub of every worker process, and the Hub
+delivers them to the SSE connections it holds. LocalBroker only reaches the
+current process; with several ASGI workers, point EVENT_BROKER at a
+cross-process implementation (e.g. Redis pub/sub) with the same publish()
+method.
+"""
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+ADMIN_CHANNEL = 'admins'
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+
+class Hub:
+    """In-process fan-out from channels to the queues of connected SSE streams"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, channels):
+        """Register a queue for `channels`; call from the event loop that will read it"""
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            for channel in channels:
+                self._subscribers.setdefault(channel, set()).add(entry)
+        return queue
+
+    def unsubscribe(self, queue, channels):
+        with self._lock:
+            for channel in channels:
+                entries = self._subscribers.get(channel, set())
+                entries.difference_update({e for e in entries if e[1] is queue})
+                if not entries:
+                    self._subscribers.pop(channel, None)
+
+    def dispatch(self, channel, event):
+        """Deliver to every local subscriber; safe to call from any thread"""
+        with self._lock:
+            entries = list(self._subscribers.get(channel, ()))
+        for loop, queue in entries:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, event)
+            except RuntimeError:
+                # The subscriber's loop has shut down; unsubscribe() will follow
+                pass
+
+    def subscriber_count(self):
+        with self._lock:
+            return len({id(q) for entries in self._subscribers.values() for _, q in entries})
+
+
+def _offer(queue, event):
+    # A stalled client loses events rather than growing memory without bound;
+    # its page resyncs from the API when it next reconnects
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        pass
+
+
+hub = Hub()
+
+
+class LocalBroker:
+    """Single-process broker: publishes straight into this worker's hub"""
+
+    def publish(self, channel, event):
+        hub.dispatch(channel, event)
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = import_string(settings.EVENT_BROKER)()
+    return _broker
+
+
+def publish(channels, event):
+    """Publish `event` (a JSON-serialisable dict) once the current transaction commits"""
+    def send():
+        payload = json.dumps(event)
+        broker = get_broker()
+        for channel in channels:
+            broker.publish(channel, payload)
+    transaction.on_commit(send)
@@ -0,0 +1,390 @@
+import math
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, time as dt_time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from core.caching import LEADERBOARD_SCOPE, UNRESOLVED_COUNT_KEY, bump_version
+from core.models import (
+    Assignment, DailyStudyTotal, MonthlyStudyTotal, QuickNote, StudySession,
+    SubjectFolder, SupportMessage, UserStreak,
+)
+
+SUBJECTS = [
+    'Mathematics', 'Physics', 'Chemistry', 'Biology', 'History', 'English',
+    'Computer Science', 'Economics', 'Statistics', 'Geography', 'Philosophy', 'Accounting',
+]
+TOPICS = [
+    'revision', 'formulas', 'lecture notes', 'key terms', 'exam prep', 'summary',
+    'practice problems', 'chapter review', 'lab notes', 'definitions',
+]
+WORDS = (
+    'theory equation model function proof example derivative integral matrix vector '
+    'energy reaction cell structure analysis method result concept principle law '
+    'data sample variable graph limit series system process cycle evidence source '
+    'argument essay chapter review question answer important remember exam check '
+    'formula value rate change growth market cost balance network algorithm memory'
+).split()
+ASSIGNMENT_KINDS = ['Problem Set', 'Essay', 'Lab Report', 'Project', 'Quiz Prep', 'Reading', 'Presentation']
+MESSAGE_TYPES = [('general', 5), ('feedback', 3), ('bug_report', 2), ('time_correction', 2)]
+
+# Users written per transaction; keeps SQLite commits cheap without holding one huge transaction
+USERS_PER_CHUNK = 100
+# Sessions on a study day: 1-4, mostly one or two (mean ~1.9)
+SESSIONS_PER_DAY_WEIGHTS = [45, 30, 15, 10]
+MEAN_SESSIONS_PER_DAY = 1.9
+WEEKEND_FACTOR = 0.6
+# Share of the window an average user studies in: users join uniformly across it,
+# and the quarter who drop out leave halfway through what remains on average
+ACTIVE_SHARE = 0.5 * (1 - 0.25 * 0.5) * (5 + 2 * WEEKEND_FACTOR) / 7
+
+
+class BulkWriter:
+    """
+    Buffers rows per model and inserts each batch with one executemany().
+    Skipping model instances and the ORM insert compiler is what makes millions
+    of rows practical, but it also skips field defaults: every NOT NULL column,
+    auto_now timestamps included, must be passed to add().
+    """
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.pending = defaultdict(list)
+        self.written = defaultdict(int)
+
+    def add(self, model, **values):
+        key = (model, tuple(values))
+        self.pending[key].append(tuple(values.values()))
+        if len(self.pending[key]) >= self.batch_size:
+            self.flush(key)
+
+    def flush(self, key=None):
+        for model, names in [key] if key else list(self.pending):
+            rows = self.pending.pop((model, names), [])
+            if not rows:
+                continue
+            fields = [model._meta.get_field(name) for name in names]
+            adapters = [self.adapter(field) for field in fields]
+            sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+                connection.ops.quote_name(model._meta.db_table),
+                ', '.join(connection.ops.quote_name(field.column) for field in fields),
+                ', '.join(['%s'] * len(fields)),
+            )
+            if any(adapters):
+                rows = [
+                    tuple(adapt(value) if adapt else value for adapt, value in zip(adapters, row))
+                    for row in rows
+                ]
+            with connection.cursor() as cursor:
+                cursor.executemany(sql, rows)
+            self.written[model] += len(rows)
+
+    @staticmethod
+    def adapter(field):
+        # Dates are the only values the drivers don't take as-is
+        if isinstance(field, models.DateTimeField):
+            return connection.ops.adapt_datetimefield_value
+        if isinstance(field, models.DateField):
+            return connection.ops.adapt_datefield_value
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Generate a large, seeded synthetic dataset (users, sessions, assignments, notes, messages) for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Number of users to create (default: 100)')
+        parser.add_argument(
+            '--sessions', type=int, default=200,
+            help='Average study sessions per user; individual users vary widely (default: 200)',
+        )
+        parser.add_argument('--days', type=int, default=365, help='Days of history to generate (default: 365)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed gives the same data (default: 42)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert (default: 5000)')
+        parser.add_argument('--prefix', default='load_', help="Username prefix for generated users (default: 'load_')")
+        parser.add_argument('--password', default='loadtest123', help='Password for every generated user')
+        parser.add_argument(
+            '--end-date', type=lambda s: datetime.strptime(s, '%Y-%m-%d').date(),
+            help='Last day of generated history, YYYY-MM-DD (default: today)',
+        )
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['days'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--users, --days and --batch-size must be positive')
+        prefix = options['prefix']
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(f"Users with prefix '{prefix}' already exist; pick another --prefix")
+
+        self.rng = random.Random(options['seed'])
+        self.days = options['days']
+        self.tz = timezone.get_current_timezone()
+        self.now = timezone.now()
+        self.end_date = timezone.localdate(self.now)
+        if options['end_date']:
+            # Pin "now" too, so timestamps (not just counts) repeat exactly for a seed
+            self.end_date = options['end_date']
+            self.now = datetime.combine(self.end_date, dt_time(23, 59), tzinfo=self.tz)
+        admin = User.objects.filter(is_superuser=True).order_by('pk').first()
+        self.admin_id = admin.pk if admin else None
+        # Lognormal activity has mean exp(sigma^2 / 2); divide it and ACTIVE_SHARE
+        # out so --sessions comes out as the average per user
+        self.session_scale = options['sessions'] / (math.exp(0.8 ** 2 / 2) * ACTIVE_SHARE)
+
+        started = time.monotonic()
+        joined = self.create_users(prefix, options['users'], options['password'], options['batch_size'])
+        user_ids = list(joined)
+
+        writer = BulkWriter(options['batch_size'])
+        for start in range(0, len(user_ids), USERS_PER_CHUNK):
+            chunk = user_ids[start:start + USERS_PER_CHUNK]
+            with transaction.atomic():
+                folders = self.create_folders(chunk, options['batch_size'])
+                for user_id in chunk:
+                    self.generate_user(writer, user_id, joined[user_id], folders[user_id])
+                writer.flush()
+            self.stdout.write(
+                f"{start + len(chunk)}/{len(user_ids)} users, "
+                f"{writer.written[StudySession]} sessions ({time.monotonic() - started:.0f}s)"
+            )
+
+        # Bulk inserts skip the signals and version bumps the views rely on
+        bump_version(LEADERBOARD_SCOPE)
+        cache.delete(UNRESOLVED_COUNT_KEY)
+
+        summary = ', '.join(
+            f"{count} {model._meta.verbose_name_plural}" for model, count in writer.written.items()
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(user_ids)} users, {summary} in {time.monotonic() - started:.1f}s"
+        ))
+
+    def create_users(self, prefix, count, password, batch_size):
+        # Hashing is deliberately slow, so every user shares one hash
+        password_hash = make_password(password)
+        width = len(str(count))
+        users = []
+        for i in range(count):
+            username = f'{prefix}{i:0{width}d}'
+            joined = self.end_date - timedelta(days=self.rng.randint(0, self.days - 1))
+            users.append(User(
+                username=username,
+                email=f'{username}@example.com',
+                password=password_hash,
+                date_joined=datetime.combine(joined, dt_time(9), tzinfo=self.tz),
+            ))
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=batch_size)
+        # pk -> join date, in username order so generation follows the seed
+        return {
+            pk: timezone.localtime(date_joined).date()
+            for pk, date_joined in User.objects.filter(username__startswith=prefix)
+            .order_by('username').values_list('pk', 'date_joined')
+        }
+
+    def create_folders(self, user_ids, batch_size):
+        """Pick each user's subjects and create a notes folder for most of them"""
+        self.subjects = {}
+        folders = []
+        for user_id in user_ids:
+            subjects = self.rng.sample(SUBJECTS, self.rng.randint(2, 6))
+            self.subjects[user_id] = subjects
+            folders.extend(
+                SubjectFolder(user_id=user_id, name=name)
+                for name in subjects if self.rng.random() < 0.7
+            )
+        SubjectFolder.objects.bulk_create(folders, batch_size=batch_size)
+
+        by_user = {user_id: [] for user_id in user_ids}
+        for folder in SubjectFolder.objects.filter(user_id__in=user_ids).order_by('user_id', 'name'):
+            by_user[folder.user_id].append(folder)
+        return by_user
+
+    def generate_user(self, writer, user_id, joined, folders):
+        subjects = self.subjects[user_id]
+        # Favour a user's first subjects so per-subject totals are skewed, as in real use
+        weights = [1 / (i + 1) for i in range(len(subjects))]
+        since = datetime.combine(joined, dt_time(9), tzinfo=self.tz)
+        self.generate_sessions(writer, user_id, subjects, weights, joined)
+        self.generate_assignments(writer, user_id, subjects, weights, since)
+        self.generate_notes(writer, user_id, subjects, folders, since)
+        self.generate_messages(writer, user_id, since)
+
+    def generate_sessions(self, writer, user_id, subjects, weights, joined):
+        rng = self.rng
+        active_days = (self.end_date - joined).days + 1
+        # Heavy-tailed engagement: most users study a little, a few study a lot.
+        # Past ~one study day in two, heavy users study more per day rather than more days
+        per_day = self.session_scale * rng.lognormvariate(0, 0.8) / self.days
+        study_chance = min(0.95, per_day / MEAN_SESSIONS_PER_DAY)
+        intensity = per_day / (study_chance * MEAN_SESSIONS_PER_DAY)
+        # Some users drift away before the end of the window
+        last_day = self.end_date
+        if rng.random() < 0.25:
+            last_day -= timedelta(days=rng.randint(0, active_days - 1))
+
+        daily = {}
+        day = joined
+        while day <= last_day:
+            chance = study_chance * (WEEKEND_FACTOR if day.weekday() >= 5 else 1.0)
+            if rng.random() < chance:
+                count = rng.choices(range(1, 5), SESSIONS_PER_DAY_WEIGHTS)[0]
+                count = max(1, round(count * intensity))
+                minutes = 0
+                for _ in range(count):
+                    duration = max(5, min(240, int(rng.lognormvariate(math.log(35), 0.6))))
+                    minutes += duration
+                    writer.add(
+                        StudySession,
+                        user=user_id,
+                        subject=rng.choices(subjects, weights)[0],
+                        duration=duration,
+                        date=day,
+                        created_at=datetime.combine(day, dt_time(rng.randint(7, 23), rng.randint(0, 59)), tzinfo=self.tz),
+                    )
+                daily[day] = (minutes, count)
+            day += timedelta(days=1)
+
+        self.write_rollups(writer, user_id, daily)
+
+    def write_rollups(self, writer, user_id, daily):
+        """Build the daily, monthly and streak rollups from the generated days directly,
+        rather than re-aggregating millions of sessions afterwards"""
+        monthly = defaultdict(lambda: [0, 0])
+        highest = run = 0
+        previous = None
+        for day in sorted(daily):
+            minutes, count = daily[day]
+            writer.add(DailyStudyTotal, user=user_id, date=day, minutes=minutes, session_count=count)
+            month = monthly[day.replace(day=1)]
+            month[0] += minutes
+            month[1] += count
+
+            run = run + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+            highest = max(highest, run)
+            previous = day
+
+        for month, (minutes, count) in monthly.items():
+            writer.add(MonthlyStudyTotal, user=user_id, month=month, minutes=minutes, session_count=count)
+        if daily:
+            writer.add(
+                UserStreak, user=user_id, current_streak=run, highest_streak=highest,
+                last_study_date=previous, updated_at=self.now,
+            )
+
+    def generate_assignments(self, writer, user_id, subjects, weights, since):
+        rng = self.rng
+        for _ in range(min(40, int(rng.expovariate(1 / 8)))):
+            subject = rng.choices(subjects, weights)[0]
+            deadline = None
+            if rng.random() < 0.9:
+                deadline = self.now + timedelta(days=rng.uniform(-30, 45))
+            created_at = self.clamp((deadline or self.now) - timedelta(days=rng.uniform(3, 30)), since)
+
+            overdue = deadline is not None and deadline < self.now
+            status = rng.choices(
+                ['todo', 'in_progress', 'completed'],
+                [10, 10, 80] if overdue else [50, 30, 20],
+            )[0]
+            completed_at = None
+            if status == 'completed':
+                completed_at = self.clamp(min(self.now, deadline or self.now) - timedelta(hours=rng.uniform(0, 72)), created_at)
+
+            writer.add(
+                Assignment,
+                user=user_id,
+                title=f'{subject} {rng.choice(ASSIGNMENT_KINDS)} {rng.randint(1, 12)}',
+                description=self.sentence(8, 30) if rng.random() < 0.6 else '',
+                subject=subject,
+                deadline=deadline,
+                estimated_hours=rng.choice([1, 2, 2, 3, 4, 6, 8]),
+                status=status,
+                # Normally filled in by Assignment.save()
+                urgency=self.urgency(deadline),
+                priority=rng.choices(['low', 'normal', 'high'], [2, 6, 2])[0],
+                created_at=created_at,
+                updated_at=completed_at or created_at,
+                completed_at=completed_at,
+            )
+
+    def generate_notes(self, writer, user_id, subjects, folders, since):
+        rng = self.rng
+        if rng.random() < 0.3:
+            return
+        for _ in range(min(80, int(rng.expovariate(1 / 12)))):
+            folder = rng.choice(folders) if folders and rng.random() < 0.85 else None
+            subject = folder.name if folder else rng.choice(subjects)
+            created_at = self.random_time(since)
+            updated_at = created_at
+            if rng.random() < 0.4:
+                updated_at = self.random_time(created_at)
+            pinned = rng.random() < 0.05
+            writer.add(
+                QuickNote,
+                user=user_id,
+                subject_folder=folder.pk if folder else None,
+                subject=subject,
+                title=f'{subject} {rng.choice(TOPICS)}',
+                content=self.sentence(15, 250)[:2000],
+                study_duration=rng.choice([None, 25, 45, 60]),
+                is_pinned=pinned,
+                pinned_at=self.random_time(created_at) if pinned else None,
+                created_at=created_at,
+                updated_at=updated_at,
+            )
+
+    def generate_messages(self, writer, user_id, since):
+        rng = self.rng
+        if rng.random() >= 0.15:
+            return
+        for _ in range(rng.randint(1, 3)):
+            message_type = rng.choices(*zip(*MESSAGE_TYPES))[0]
+            created_at = self.random_time(since)
+            resolved = rng.random() < 0.6
+            responded_at = None
+            if resolved:
+                responded_at = min(self.now, created_at + timedelta(hours=rng.expovariate(1 / 24)))
+            writer.add(
+                SupportMessage,
+                sender=user_id,
+                recipient=self.admin_id,
+                message_type=message_type,
+                subject=self.sentence(3, 8).capitalize(),
+                content=self.sentence(10, 80),
+                requested_duration=rng.randint(15, 180) if message_type == 'time_correction' else None,
+                is_read=resolved or rng.random() < 0.3,
+                is_resolved=resolved,
+                is_approved_feedback=message_type == 'feedback' and resolved and rng.random() < 0.3,
+                admin_response=self.sentence(5, 40) if resolved else None,
+                responded_at=responded_at,
+                created_at=created_at,
+                updated_at=responded_at or created_at,
+            )
+
+    def urgency(self, deadline):
+        """Assignment.calculate_urgency() as of self.now, so a pinned --end-date repeats exactly"""
+        if deadline is None:
+            return 'low'
+        days = (deadline.date() - self.now.date()).days
+        if days <= Assignment.HIGH_URGENCY_DAYS:
+            return 'high'
+        if days <= Assignment.MEDIUM_URGENCY_DAYS:
+            return 'medium'
+        return 'low'
+
+    def sentence(self, low, high):
+        return ' '.join(self.rng.choices(WORDS, k=self.rng.randint(low, high)))
+
+    def random_time(self, since):
+        """A moment between `since` and now, biased towards recent activity"""
+        span = max(0.0, (self.now - since).total_seconds())
+        return self.now - timedelta(seconds=span * self.rng.random() ** 2)
+
+    def clamp(self, moment, earliest):
+        return min(self.now, max(moment, earliest))
@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import DailyStudyTotal, MonthlyStudyTotal, UserStreak
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the study time rollups (daily totals, monthly totals and streaks) from raw study sessions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only rebuild rollups for this username')
+        parser.add_argument(
+            '--skip-monthly',
+            action='store_true',
+            help='Leave MonthlyStudyTotal alone (refresh_leaderboards rebuilds it on its own)',
+        )
+        parser.add_argument(
+            '--skip-streaks',
+            action='store_true',
+            help='Leave UserStreak alone (repair_streaks rebuilds it on its own)',
+        )
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' not found")
+
+        scope = f"user {user.username}" if user else "all users"
+
+        # Monthly totals are summed from the daily rollup, so rebuild them together
+        with transaction.atomic():
+            count = DailyStudyTotal.rebuild(user=user)
+            if not options['skip_monthly']:
+                monthly = MonthlyStudyTotal.rebuild(user=user)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} daily totals for {scope}"))
+        if not options['skip_monthly']:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {monthly} monthly totals for {scope}"))
+
+        if not options['skip_streaks']:
+            users = User.objects.all() if user is None else User.objects.filter(pk=user.pk)
+            repaired = 0
+            for streak_user in users.iterator():
+                with transaction.atomic():
+                    UserStreak.rebuild(streak_user)
+                repaired += 1
+            self.stdout.write(self.style.SUCCESS(f"Repaired streaks for {repaired} users"))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import MonthlyStudyTotal
+
+
+class Command(BaseCommand):
+    help = 'Recompute the monthly study time leaderboard table (run on a schedule to reconcile drift)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all-months',
+            action='store_true',
+            help='Rebuild every month instead of only the current one',
+        )
+
+    def handle(self, *args, **options):
+        month = None if options['all_months'] else timezone.now().date().replace(day=1)
+
+        with transaction.atomic():
+            count = MonthlyStudyTotal.rebuild(month=month)
+
+        scope = 'all months' if month is None else month.strftime('%B %Y')
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} monthly totals for {scope}"))
@@ -0,0 +1,27 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import UserStreak
+
+
+class Command(BaseCommand):
+    help = 'Recompute persisted study streaks from study session history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only repair the streak for this username')
+
+    def handle(self, *args, **options):
+        users = User.objects.all()
+        if options['user']:
+            users = users.filter(username=options['user'])
+            if not users.exists():
+                raise CommandError(f"User '{options['user']}' not found")
+
+        repaired = 0
+        for user in users.iterator():
+            with transaction.atomic():
+                UserStreak.rebuild(user)
+            repaired += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Repaired streaks for {repaired} users"))
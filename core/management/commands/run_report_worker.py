@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import ReportJob
+from core.reports import STALE_JOB_AGE, claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = 'Process queued admin PDF report jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit when the queue is empty instead of polling',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds between queue polls (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        # Jobs left running by a crashed worker would otherwise block new requests
+        abandoned = ReportJob.objects.filter(
+            status='running',
+            started_at__lt=timezone.now() - STALE_JOB_AGE,
+        ).update(status='failed', error='Worker stopped before finishing', finished_at=timezone.now())
+        if abandoned:
+            self.stdout.write(self.style.WARNING(f"Marked {abandoned} abandoned jobs as failed"))
+
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+                continue
+
+            self.stdout.write(f"Building report #{job.pk}...")
+            job = run_job(job)
+            if job.status == 'done':
+                self.stdout.write(self.style.SUCCESS(f"Report #{job.pk} saved to {job.file.name}"))
+            else:
+                self.stdout.write(self.style.ERROR(f"Report #{job.pk} failed: {job.error}"))
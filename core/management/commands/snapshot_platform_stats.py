@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import PlatformDailySnapshot
+
+
+class Command(BaseCommand):
+    help = 'Record platform totals for the admin dashboard (run on a schedule, e.g. hourly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Recount the last N days, e.g. to backfill trend history (default: from the latest snapshot through today)',
+        )
+
+    def handle(self, *args, **options):
+        days = options['days']
+        if days is not None and days < 1:
+            raise CommandError('--days must be at least 1')
+
+        with transaction.atomic():
+            count = PlatformDailySnapshot.rebuild(days=days)
+
+        latest = PlatformDailySnapshot.objects.first()
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {count} daily snapshots; {latest.date}: {latest.total_users} users, "
+            f"{latest.total_sessions} sessions, {latest.total_notes} notes"
+        ))
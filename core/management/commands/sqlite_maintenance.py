@@ -0,0 +1,90 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection
+
+INCREMENTAL = 2  # PRAGMA auto_vacuum value
+
+
+class Command(BaseCommand):
+    help = 'Refresh SQLite planner statistics, reclaim free pages and report table and index sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages',
+            type=int,
+            default=0,
+            help='Free pages to reclaim with incremental VACUUM; 0 reclaims all of them (default: 0)',
+        )
+        parser.add_argument(
+            '--enable-incremental',
+            action='store_true',
+            help='Switch the database to incremental auto-vacuum (runs one full VACUUM, locking the database)',
+        )
+        parser.add_argument('--top', type=int, default=20, help='Largest tables/indexes to list (default: 20)')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('sqlite_maintenance only supports the SQLite backend')
+
+        with connection.cursor() as cursor:
+            page_size = self.pragma(cursor, 'page_size')
+            size_before = self.pragma(cursor, 'page_count') * page_size
+
+            self.stdout.write('Updating planner statistics...')
+            cursor.execute('ANALYZE')
+            cursor.execute('PRAGMA optimize')
+
+            if options['enable_incremental'] and self.pragma(cursor, 'auto_vacuum') != INCREMENTAL:
+                self.stdout.write('Switching to incremental auto-vacuum (full VACUUM)...')
+                cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                cursor.execute('VACUUM')
+
+            free_pages = self.pragma(cursor, 'freelist_count')
+            if self.pragma(cursor, 'auto_vacuum') == INCREMENTAL:
+                cursor.execute(f"PRAGMA incremental_vacuum({max(options['pages'], 0)})")
+                cursor.fetchall()  # the pragma frees pages as its rows are stepped through
+                freed = free_pages - self.pragma(cursor, 'freelist_count')
+                self.stdout.write(f'Reclaimed {freed} of {free_pages} free pages')
+            elif free_pages:
+                self.stdout.write(self.style.WARNING(
+                    f'{free_pages} free pages ({free_pages * page_size / 1024 / 1024:.1f} MB) cannot be reclaimed '
+                    'incrementally; run once with --enable-incremental'
+                ))
+
+            # Fold the WAL back into the main file so it doesn't keep growing
+            cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            cursor.fetchall()
+
+            size_after = self.pragma(cursor, 'page_count') * page_size
+            self.report_sizes(cursor, options['top'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Database is {size_after / 1024 / 1024:.1f} MB (was {size_before / 1024 / 1024:.1f} MB)'
+        ))
+
+    def pragma(self, cursor, name):
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+    def report_sizes(self, cursor, top):
+        try:
+            # dbstat is an optional SQLite extension, compiled into most builds
+            cursor.execute(
+                "SELECT s.name, COALESCE(m.type, 'internal'), COALESCE(m.tbl_name, s.name), SUM(s.pgsize) "
+                "FROM dbstat s LEFT JOIN sqlite_master m ON m.name = s.name "
+                "GROUP BY s.name ORDER BY SUM(s.pgsize) DESC"
+            )
+        except DatabaseError:
+            self.stdout.write(self.style.WARNING('Size report unavailable: SQLite was built without dbstat'))
+            return
+        rows = cursor.fetchall()
+        shown = rows[:top]
+        name_width = max([len('Name')] + [len(row[0]) for row in shown])
+        table_width = max([len('Table')] + [len(row[2]) for row in shown])
+
+        self.stdout.write(f"\n{'Name':<{name_width}}  {'Type':<8}  {'Table':<{table_width}}  {'Size':>11}")
+        for name, kind, table, size in shown:
+            self.stdout.write(f'{name:<{name_width}}  {kind:<8}  {table:<{table_width}}  {size / 1024:>8.0f} KB')
+        if len(rows) > top:
+            rest = sum(size for *_, size in rows[top:])
+            label = f'... {len(rows) - top} more'
+            self.stdout.write(f'{label:<{name_width + table_width + 12}}  {rest / 1024:>8.0f} KB')
@@ -0,0 +1,269 @@
+"""
+Per-view request metrics.
+
+MetricsMiddleware times every request and counts the SQL it runs, keyed by URL
+name. Samples go into a fixed-size ring buffer in each worker process. Every
+METRICS_FLUSH_SECONDS, or once the buffer is full, the worker folds them into
+hourly RequestMetric rows shared by all workers. The flush runs from
+request_finished, after the response has gone out, so no request waits on it.
+The admin metrics page reads those rows.
+"""
+import contextvars
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import ExitStack
+from datetime import timedelta
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections, transaction
+from django.utils import timezone
+
+from .models import RequestMetric
+
+# Upper bounds (ms) of the latency histogram buckets; the last one catches everything slower
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, math.inf)
+RETENTION = timedelta(days=30)
+UNRESOLVED = '<unresolved>'
+
+# Timer of the request being handled; copied into threads that query on its behalf (core.reads)
+current_sql_timer = contextvars.ContextVar('current_sql_timer', default=None)
+
+
+class SqlTimer:
+    """Database execute wrapper that counts queries and the time spent in them"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            # Pool threads running reads for the same request share this timer
+            with self._lock:
+                self.count += 1
+                self.seconds += time.perf_counter() - started
+
+    def wrap_connections(self, stack):
+        """Time every connection of the current thread until `stack` closes"""
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+
+
+class Recorder:
+    """Ring buffer of (url_name, finished_at, ms, status, queries, sql_ms) samples for one worker"""
+
+    def __init__(self, size):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=size)
+        self._last_flush = time.monotonic()
+
+    def record(self, sample):
+        with self._lock:
+            self._samples.append(sample)
+
+    def flush_if_due(self):
+        """Flush once the buffer is full or METRICS_FLUSH_SECONDS have passed"""
+        with self._lock:
+            due = self._samples and (
+                len(self._samples) == self._samples.maxlen
+                or time.monotonic() - self._last_flush >= settings.METRICS_FLUSH_SECONDS
+            )
+        if due:
+            self.flush()
+
+    def drain(self):
+        with self._lock:
+            samples = list(self._samples)
+            self._samples.clear()
+            self._last_flush = time.monotonic()
+        return samples
+
+    def flush(self):
+        """Fold buffered samples into the hourly RequestMetric rows; returns how many were written"""
+        samples = self.drain()
+        if not samples:
+            return 0
+
+        windows = {}
+        for url_name, finished_at, ms, status, queries, sql_ms in samples:
+            window_start = finished_at.replace(minute=0, second=0, microsecond=0)
+            metric = windows.get((url_name, window_start))
+            if metric is None:
+                metric = windows[(url_name, window_start)] = _empty_metric(url_name, window_start)
+            metric.request_count += 1
+            metric.error_count += status >= 500
+            metric.total_ms += ms
+            metric.max_ms = max(metric.max_ms, ms)
+            metric.histogram[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+            metric.query_count += queries
+            metric.sql_ms += sql_ms
+
+        try:
+            with transaction.atomic():
+                for (url_name, window_start), delta in windows.items():
+                    metric, _ = RequestMetric.objects.select_for_update().get_or_create(
+                        url_name=url_name,
+                        window_start=window_start,
+                        defaults={'histogram': [0] * len(LATENCY_BUCKETS_MS)},
+                    )
+                    _merge(metric, delta)
+                    metric.save()
+                RequestMetric.objects.filter(window_start__lt=timezone.now() - RETENTION).delete()
+        except DatabaseError:
+            # Metrics are best effort: a locked or unavailable database drops this batch
+            return 0
+        return len(samples)
+
+
+def _empty_metric(url_name, window_start):
+    return RequestMetric(
+        url_name=url_name,
+        window_start=window_start,
+        max_ms=0,
+        histogram=[0] * len(LATENCY_BUCKETS_MS),
+    )
+
+
+def _merge(metric, other):
+    metric.request_count += other.request_count
+    metric.error_count += other.error_count
+    metric.total_ms += other.total_ms
+    metric.max_ms = max(metric.max_ms, other.max_ms)
+    # Rows written before a bucket was added are padded rather than misaligned
+    size = max(len(metric.histogram), len(other.histogram))
+    metric.histogram = [
+        a + b for a, b in zip(
+            metric.histogram + [0] * (size - len(metric.histogram)),
+            other.histogram + [0] * (size - len(other.histogram)),
+        )
+    ]
+    metric.query_count += other.query_count
+    metric.sql_ms += other.sql_ms
+
+
+recorder = Recorder(settings.METRICS_BUFFER_SIZE)
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status and SQL usage of every request into the worker's
+    recorder. Streaming responses (event streams, exports) do their work after
+    the view returns, possibly for minutes, so they are not recorded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = SqlTimer()
+        started = time.perf_counter()
+        token = current_sql_timer.set(timer)
+        try:
+            with ExitStack() as stack:
+                timer.wrap_connections(stack)
+                response = self.get_response(request)
+        finally:
+            current_sql_timer.reset(token)
+        self._record(request, response, timer, started)
+        return response
+
+    async def __acall__(self, request):
+        timer = SqlTimer()
+        started = time.perf_counter()
+        token = current_sql_timer.set(timer)
+        stack = ExitStack()
+        try:
+            # The async ORM queries from the request's sync thread, so wrap the connections there
+            await sync_to_async(timer.wrap_connections)(stack)
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            current_sql_timer.reset(token)
+        self._record(request, response, timer, started)
+        return response
+
+    def _record(self, request, response, timer, started):
+        if response.streaming:
+            return
+        match = request.resolver_match
+        recorder.record((
+            match.view_name if match else UNRESOLVED,
+            timezone.now(),
+            (time.perf_counter() - started) * 1000,
+            response.status_code,
+            timer.count,
+            timer.seconds * 1000,
+        ))
+
+
+def histogram_percentile(histogram, pct):
+    """Upper bound (ms) of the bucket holding the pct-th percentile request"""
+    total = sum(histogram)
+    if not total:
+        return None
+    threshold = pct / 100 * total
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS_MS, histogram):
+        seen += count
+        if seen >= threshold:
+            return bound
+    return LATENCY_BUCKETS_MS[-1]
+
+
+def bucket_label(bound):
+    if bound is None:
+        return '-'
+    if math.isinf(bound):
+        return f'> {LATENCY_BUCKETS_MS[-2]:g} ms'
+    return f'≤ {bound:g} ms'
+
+
+def summarize(metrics):
+    """Combine hourly RequestMetric rows into one summary per URL name, slowest total first"""
+    combined = {}
+    for metric in metrics:
+        if metric.url_name not in combined:
+            combined[metric.url_name] = _empty_metric(metric.url_name, metric.window_start)
+        _merge(combined[metric.url_name], metric)
+
+    rows = []
+    for metric in combined.values():
+        count = metric.request_count or 1
+        busiest = max(metric.histogram) or 1
+        rows.append({
+            'url_name': metric.url_name,
+            'requests': metric.request_count,
+            'errors': metric.error_count,
+            'avg_ms': metric.total_ms / count,
+            'p50': bucket_label(histogram_percentile(metric.histogram, 50)),
+            'p95': bucket_label(histogram_percentile(metric.histogram, 95)),
+            'max_ms': metric.max_ms,
+            'total_s': metric.total_ms / 1000,
+            'avg_queries': metric.query_count / count,
+            'avg_sql_ms': metric.sql_ms / count,
+            'sql_share': 100 * metric.sql_ms / metric.total_ms if metric.total_ms else 0,
+            'histogram': [
+                {'label': bucket_label(bound), 'count': n, 'height': round(100 * n / busiest)}
+                for bound, n in zip(LATENCY_BUCKETS_MS, metric.histogram)
+            ],
+        })
+    rows.sort(key=lambda row: row['total_s'], reverse=True)
+    return rows
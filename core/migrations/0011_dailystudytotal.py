@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_daily_totals(apps, schema_editor):
+    StudySession = apps.get_model('core', 'StudySession')
+    DailyStudyTotal = apps.get_model('core', 'DailyStudyTotal')
+    totals = StudySession.objects.order_by().values('user_id', 'date').annotate(
+        total=models.Sum('duration'),
+        count=models.Count('id'),
+    )
+    DailyStudyTotal.objects.bulk_create(
+        [
+            DailyStudyTotal(user_id=t['user_id'], date=t['date'], minutes=t['total'] or 0, session_count=t['count'])
+            for t in totals
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_alter_assignment_deadline'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStudyTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('minutes', models.IntegerField(default=0)),
+                ('session_count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_study_totals', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-date'],
+                'unique_together': {('user', 'date')},
+            },
+        ),
+        migrations.RunPython(populate_daily_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:06
+
+import django.db.models.deletion
+from django.conf import settings
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def populate_streaks(apps, schema_editor):
+    StudySession = apps.get_model('core', 'StudySession')
+    UserStreak = apps.get_model('core', 'UserStreak')
+    rows = StudySession.objects.order_by('user_id', 'date').values_list('user_id', 'date').distinct()
+
+    streaks = {}
+    for user_id, date in rows:
+        state = streaks.get(user_id)
+        if state is None:
+            streaks[user_id] = state = {'run': 1, 'highest': 1, 'last': date}
+            continue
+        state['run'] = state['run'] + 1 if date - state['last'] == timedelta(days=1) else 1
+        state['highest'] = max(state['highest'], state['run'])
+        state['last'] = date
+
+    UserStreak.objects.bulk_create(
+        [
+            UserStreak(user_id=user_id, current_streak=s['run'], highest_streak=s['highest'], last_study_date=s['last'])
+            for user_id, s in streaks.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0011_dailystudytotal'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStreak',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='streak', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('current_streak', models.IntegerField(default=0, help_text='Length of the run ending at last_study_date')),
+                ('highest_streak', models.IntegerField(default=0)),
+                ('last_study_date', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(populate_streaks, migrations.RunPython.noop),
+    ]
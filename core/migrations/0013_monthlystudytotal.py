@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import TruncMonth
+
+
+def populate_monthly_totals(apps, schema_editor):
+    DailyStudyTotal = apps.get_model('core', 'DailyStudyTotal')
+    MonthlyStudyTotal = apps.get_model('core', 'MonthlyStudyTotal')
+    totals = DailyStudyTotal.objects.order_by().annotate(month=TruncMonth('date')).values('user_id', 'month').annotate(
+        total=models.Sum('minutes'),
+        count=models.Sum('session_count'),
+    )
+    MonthlyStudyTotal.objects.bulk_create(
+        [
+            MonthlyStudyTotal(user_id=t['user_id'], month=t['month'], minutes=t['total'] or 0, session_count=t['count'] or 0)
+            for t in totals
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_userstreak'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyStudyTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('minutes', models.IntegerField(default=0)),
+                ('session_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-month', '-minutes'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='userstreak',
+            index=models.Index(fields=['-current_streak', 'last_study_date'], name='core_streak_rank_idx'),
+        ),
+        migrations.AddField(
+            model_name='monthlystudytotal',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_study_totals', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='monthlystudytotal',
+            index=models.Index(fields=['month', '-minutes'], name='core_monthly_rank_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='monthlystudytotal',
+            unique_together={('user', 'month')},
+        ),
+        migrations.RunPython(populate_monthly_totals, migrations.RunPython.noop),
+    ]
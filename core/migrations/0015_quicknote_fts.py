@@ -0,0 +1,52 @@
+# Full-text index for QuickNote (SQLite FTS5)
+
+from django.db import migrations
+
+# `scope` holds "u<user_id> f<folder_id>" tokens so per-user and per-folder
+# filters are resolved inside the index instead of after matching every user's notes
+SCOPE_EXPR = "'u' || {row}.user_id || ' f' || IFNULL({row}.subject_folder_id, 0)"
+
+CREATE_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS core_quicknote_fts USING fts5("
+    "title, content, scope, tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS core_quicknote_fts_ai AFTER INSERT ON core_quicknote BEGIN "
+    "INSERT INTO core_quicknote_fts(rowid, title, content, scope) "
+    f"VALUES (new.id, new.title, new.content, {SCOPE_EXPR.format(row='new')}); END",
+    "CREATE TRIGGER IF NOT EXISTS core_quicknote_fts_ad AFTER DELETE ON core_quicknote BEGIN "
+    "DELETE FROM core_quicknote_fts WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS core_quicknote_fts_au "
+    "AFTER UPDATE OF title, content, user_id, subject_folder_id ON core_quicknote BEGIN "
+    "DELETE FROM core_quicknote_fts WHERE rowid = old.id; "
+    "INSERT INTO core_quicknote_fts(rowid, title, content, scope) "
+    f"VALUES (new.id, new.title, new.content, {SCOPE_EXPR.format(row='new')}); END",
+    "INSERT INTO core_quicknote_fts(rowid, title, content, scope) "
+    f"SELECT id, title, content, {SCOPE_EXPR.format(row='core_quicknote')} FROM core_quicknote",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS core_quicknote_fts_ai",
+    "DROP TRIGGER IF EXISTS core_quicknote_fts_ad",
+    "DROP TRIGGER IF EXISTS core_quicknote_fts_au",
+    "DROP TABLE IF EXISTS core_quicknote_fts",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        # Other backends fall back to a plain icontains search (QuickNote.search)
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_reportjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(CREATE_SQL), _run(DROP_SQL)),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_quicknote_fts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quicknote',
+            index=models.Index(fields=['user', '-updated_at', '-id'], name='core_note_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quicknote',
+            index=models.Index(fields=['subject_folder', '-updated_at', '-id'], name='core_note_folder_feed_idx'),
+        ),
+    ]
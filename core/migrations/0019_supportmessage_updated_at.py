@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_updated_at(apps, schema_editor):
+    SupportMessage = apps.get_model('core', 'SupportMessage')
+    SupportMessage.objects.update(updated_at=models.functions.Coalesce('responded_at', 'created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_studysession_client_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supportmessage',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='supportmessage',
+            index=models.Index(fields=['sender', 'updated_at', 'id'], name='core_msg_sender_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportmessage',
+            index=models.Index(fields=['recipient', 'updated_at', 'id'], name='core_msg_recipient_sync_idx'),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_supportmessage_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['user', 'status', 'deadline'], name='core_assignment_board_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quicknote',
+            index=models.Index(condition=models.Q(('is_pinned', True)), fields=['user', '-pinned_at'], name='core_note_pinned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quicknote',
+            index=models.Index(condition=models.Q(('is_pinned', True)), fields=['subject_folder', '-pinned_at'], name='core_note_folder_pinned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studysession',
+            index=models.Index(fields=['user', 'date'], name='core_session_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportmessage',
+            index=models.Index(condition=models.Q(('is_resolved', False)), fields=['message_type', '-created_at'], name='core_msg_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportmessage',
+            index=models.Index(condition=models.Q(('is_resolved', True)), fields=['-created_at'], name='core_msg_resolved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportmessage',
+            index=models.Index(fields=['-created_at'], name='core_msg_created_idx'),
+        ),
+    ]
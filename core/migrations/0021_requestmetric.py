@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url_name', models.CharField(max_length=200)),
+                ('window_start', models.DateTimeField(help_text='Start of the hour these requests fall in')),
+                ('request_count', models.IntegerField(default=0)),
+                ('error_count', models.IntegerField(default=0, help_text='Responses with a 5xx status')),
+                ('total_ms', models.FloatField(default=0)),
+                ('max_ms', models.FloatField(default=0)),
+                ('histogram', models.JSONField(default=list)),
+                ('query_count', models.IntegerField(default=0)),
+                ('sql_ms', models.FloatField(default=0)),
+            ],
+            options={
+                'ordering': ['-window_start', 'url_name'],
+                'indexes': [models.Index(fields=['window_start'], name='core_metric_window_idx')],
+                'unique_together': {('url_name', 'window_start')},
+            },
+        ),
+    ]
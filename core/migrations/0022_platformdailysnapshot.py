@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_requestmetric'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformDailySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('taken_at', models.DateTimeField(help_text='When the totals below were counted')),
+                ('total_users', models.IntegerField(default=0)),
+                ('active_users', models.IntegerField(default=0, help_text='Users who logged in during the 7 days before')),
+                ('total_sessions', models.IntegerField(default=0)),
+                ('total_minutes', models.BigIntegerField(default=0)),
+                ('todo_assignments', models.IntegerField(default=0)),
+                ('in_progress_assignments', models.IntegerField(default=0)),
+                ('pending_assignments', models.IntegerField(default=0)),
+                ('completed_assignments', models.IntegerField(default=0)),
+                ('total_notes', models.IntegerField(default=0)),
+                ('new_users', models.IntegerField(default=0)),
+                ('studying_users', models.IntegerField(default=0)),
+                ('day_sessions', models.IntegerField(default=0)),
+                ('day_minutes', models.IntegerField(default=0)),
+                ('last_user_id', models.IntegerField(default=0)),
+                ('last_session_id', models.IntegerField(default=0)),
+                ('last_assignment_id', models.IntegerField(default=0)),
+                ('last_note_id', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_platformdailysnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='supportmessage',
+            index=models.Index(fields=['updated_at', 'id'], name='core_msg_sync_idx'),
+        ),
+    ]
@@ -1,7 +1,11 @@
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, TruncDate, TruncMonth
 from django.contrib.auth.models import User
 from django.utils import timezone
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+import re
 
 # Study Session Model
 class StudySession(models.Model):
@@ -10,121 +14,358 @@ class StudySession(models.Model):
     duration = models.IntegerField(help_text="Duration in minutes")
     date = models.DateField(default=timezone.now)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Idempotency key sent by the study timer so retried uploads aren't counted twice
+    client_id = models.CharField(max_length=64, null=True, blank=True)
     
     class Meta:
         ordering = ['-created_at']
+        unique_together = [('user', 'client_id')]
+        indexes = [
+            models.Index(fields=['user', 'date'], name='core_session_user_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.subject} - {self.duration} mins"
     
+    @classmethod
+    def record_batch(cls, user, sessions):
+        """
+        Insert unsaved sessions for `user` in one transaction, skipping any whose
+        client_id was already recorded, and update the rollups once per day.
+        Returns the sessions actually created.
+        """
+        with transaction.atomic():
+            seen = set(cls.objects.filter(
+                user=user,
+                client_id__in=[session.client_id for session in sessions],
+            ).values_list('client_id', flat=True))
+            
+            new_sessions = []
+            for session in sessions:
+                if session.client_id in seen:
+                    continue
+                seen.add(session.client_id)
+                session.user = user
+                new_sessions.append(session)
+            cls.objects.bulk_create(new_sessions)
+            
+            per_day = defaultdict(lambda: [0, 0])
+            for session in new_sessions:
+                per_day[session.date][0] += session.duration
+                per_day[session.date][1] += 1
+            for date, (minutes, count) in sorted(per_day.items()):
+                DailyStudyTotal.apply_delta(user, date, minutes=minutes, sessions=count)
+        
+        return new_sessions
+    
     @classmethod
     def get_today_total(cls, user):
         """Get total study time for today"""
         today = timezone.now().date()
-        total = cls.objects.filter(user=user, date=today).aggregate(
-            total=models.Sum('duration')
-        )['total'] or 0
-        return total
+        total = DailyStudyTotal.objects.filter(user=user, date=today).values_list(
+            'minutes', flat=True
+        ).first()
+        return total or 0
     
     @classmethod
     def get_weekly_data(cls, user):
         """Get study time for the last 7 days"""
-        today = timezone.now().date()
-        week_ago = today - timedelta(days=6)
+        return DailyStudyTotal.get_range(user, days=7)
+    
+    @classmethod
+    def get_monthly_data(cls, user):
+        """Get study time for the last 30 days"""
+        return DailyStudyTotal.get_range(user, days=30)
+    
+    @classmethod
+    def get_month_totals(cls, user, months=6):
+        """Get study time for the last `months` calendar months, including the current one"""
+        # Walk back whole calendar months from the first of this month
+        month_starts = [timezone.now().date().replace(day=1)]
+        for _ in range(months - 1):
+            month_starts.insert(0, (month_starts[0] - timedelta(days=1)).replace(day=1))
         
-        sessions = cls.objects.filter(
+        data = {month: 0 for month in month_starts}
+        rows = MonthlyStudyTotal.objects.filter(
             user=user,
-            date__gte=week_ago,
-            date__lte=today
-        )
+            month__gte=month_starts[0],
+        ).values_list('month', 'minutes')
+        for month, minutes in rows:
+            if month in data:
+                data[month] = minutes
         
-        # Create dict for each day
-        weekly_data = {}
-        for i in range(7):
-            date = week_ago + timedelta(days=i)
-            weekly_data[date] = 0
-        
-        # Fill in actual data
-        for session in sessions:
-            if session.date in weekly_data:
-                weekly_data[session.date] += session.duration
+        return data
+    
+    @classmethod
+    def get_study_streak(cls, user):
+        """Get consecutive study days (today counts once studied, otherwise from yesterday)"""
+        return UserStreak.for_user(user).current()
+    
+    @classmethod
+    def get_highest_streak(cls, user):
+        """Get the highest streak ever achieved by the user"""
+        return UserStreak.for_user(user).highest_streak
+
+
+# Daily Study Total Model (rollup of StudySession rows per user and day)
+class DailyStudyTotal(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_study_totals')
+    date = models.DateField()
+    minutes = models.IntegerField(default=0)
+    session_count = models.IntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-date']
+        unique_together = ['user', 'date']
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.date} - {self.minutes} mins"
+    
+    @classmethod
+    def apply_delta(cls, user, date, minutes=0, sessions=0):
+        """
+        Add minutes/sessions to a user's day. Call this inside transaction.atomic()
+        together with the StudySession write so both stay consistent.
+        Days that drop to zero sessions are removed.
+        """
+        row, created = cls.objects.select_for_update().get_or_create(user=user, date=date)
+        cls.objects.filter(pk=row.pk).update(
+            minutes=F('minutes') + minutes,
+            session_count=F('session_count') + sessions,
+        )
+        removed, _ = cls.objects.filter(pk=row.pk, session_count__lte=0).delete()
+        MonthlyStudyTotal.apply_delta(user, date, minutes=minutes, sessions=sessions)
         
-        return weekly_data
+        # A day only affects streaks when it starts or stops counting as studied
+        if created and not removed:
+            UserStreak.record_day(user, date)
+        elif removed and not created:
+            UserStreak.remove_day(user, date)
     
     @classmethod
-    def get_monthly_data(cls, user):
-        """Get study time for the last 30 days"""
+    def get_range(cls, user, days):
+        """Get study minutes for each of the last `days` days (oldest first)"""
         today = timezone.now().date()
-        month_ago = today - timedelta(days=29)
+        start = today - timedelta(days=days - 1)
+        
+        # Create dict for each day
+        data = {}
+        for i in range(days):
+            data[start + timedelta(days=i)] = 0
         
-        sessions = cls.objects.filter(
+        # Fill in the pre-summed rows (at most one per day)
+        rows = cls.objects.filter(
             user=user,
-            date__gte=month_ago,
+            date__gte=start,
             date__lte=today
-        )
+        ).values_list('date', 'minutes')
+        for date, minutes in rows:
+            data[date] = minutes
         
-        # Create dict for each day
-        monthly_data = {}
-        for i in range(30):
-            date = month_ago + timedelta(days=i)
-            monthly_data[date] = 0
+        return data
+    
+    @classmethod
+    def rebuild(cls, user=None):
+        """Recompute the rollup from raw StudySession rows. Returns rows written."""
+        sessions = StudySession.objects.all()
+        existing = cls.objects.all()
+        if user is not None:
+            sessions = sessions.filter(user=user)
+            existing = existing.filter(user=user)
         
-        # Fill in actual data
-        for session in sessions:
-            if session.date in monthly_data:
-                monthly_data[session.date] += session.duration
+        totals = sessions.order_by().values('user_id', 'date').annotate(
+            total=models.Sum('duration'),
+            count=models.Count('id'),
+        )
+        rows = [
+            cls(user_id=t['user_id'], date=t['date'], minutes=t['total'] or 0, session_count=t['count'])
+            for t in totals
+        ]
+        existing.delete()
+        cls.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+
+# Monthly Study Total Model (per-user month rollup, backs the study time leaderboard)
+class MonthlyStudyTotal(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='monthly_study_totals')
+    month = models.DateField(help_text="First day of the month")
+    minutes = models.IntegerField(default=0)
+    session_count = models.IntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-month', '-minutes']
+        unique_together = ['user', 'month']
+        indexes = [
+            models.Index(fields=['month', '-minutes'], name='core_monthly_rank_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.month:%b %Y} - {self.minutes} mins"
+    
+    @classmethod
+    def apply_delta(cls, user, date, minutes=0, sessions=0):
+        """Add minutes/sessions to the month containing `date` (call inside transaction.atomic)"""
+        row, _ = cls.objects.select_for_update().get_or_create(user=user, month=date.replace(day=1))
+        cls.objects.filter(pk=row.pk).update(
+            minutes=F('minutes') + minutes,
+            session_count=F('session_count') + sessions,
+        )
+        cls.objects.filter(pk=row.pk, session_count__lte=0).delete()
+    
+    @classmethod
+    def get_leaderboard(cls, month=None):
+        """Ranked study time for a month (default: current), one indexed read"""
+        month = month or timezone.now().date().replace(day=1)
+        rows = cls.objects.filter(month=month).order_by('-minutes', 'user_id').values_list(
+            'user__username', 'minutes'
+        )
+        return [
+            {'username': username, 'value': f"{round(minutes / 60, 1)}h"}
+            for username, minutes in rows
+        ]
+    
+    @classmethod
+    def rebuild(cls, month=None, user=None):
+        """Recompute monthly totals from DailyStudyTotal (all months, or just `month`). Returns rows written."""
+        daily = DailyStudyTotal.objects.all()
+        existing = cls.objects.all()
+        if user is not None:
+            daily = daily.filter(user=user)
+            existing = existing.filter(user=user)
+        if month is not None:
+            month = month.replace(day=1)
+            next_month = (month + timedelta(days=32)).replace(day=1)
+            daily = daily.filter(date__gte=month, date__lt=next_month)
+            existing = existing.filter(month=month)
         
-        return monthly_data
+        totals = daily.order_by().annotate(month=TruncMonth('date')).values('user_id', 'month').annotate(
+            total=models.Sum('minutes'),
+            count=models.Sum('session_count'),
+        )
+        rows = [
+            cls(user_id=t['user_id'], month=t['month'], minutes=t['total'] or 0, session_count=t['count'] or 0)
+            for t in totals
+        ]
+        existing.delete()
+        cls.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+
+# User Streak Model (persisted streak state, updated as study days come and go)
+class UserStreak(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='streak')
+    current_streak = models.IntegerField(default=0, help_text="Length of the run ending at last_study_date")
+    highest_streak = models.IntegerField(default=0)
+    last_study_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['-current_streak', 'last_study_date'], name='core_streak_rank_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.current_streak} days (best {self.highest_streak})"
+    
+    def current(self, today=None):
+        """Current streak, keeping the grace period for a day that has not been studied yet"""
+        today = today or timezone.now().date()
+        if self.last_study_date and self.last_study_date >= today - timedelta(days=1):
+            return self.current_streak
+        return 0
     
     @classmethod
-    def get_study_streak(cls, user):
-        """Calculate consecutive study days"""
-        today = timezone.now().date()
-        streak = 0
-        current_date = today
+    def for_user(cls, user):
+        """Single primary-key lookup; users without any study history get an unsaved empty record"""
+        return cls.objects.filter(pk=user.pk).first() or cls(user=user)
+    
+    @classmethod
+    def get_leaderboard(cls, today=None):
+        """Ranked active streaks (studied today or yesterday), one indexed read"""
+        today = today or timezone.now().date()
+        rows = cls.objects.filter(
+            current_streak__gt=0,
+            last_study_date__gte=today - timedelta(days=1),
+        ).order_by('-current_streak', 'user_id').values_list('user__username', 'current_streak')
+        return [
+            {'username': username, 'streak': streak, 'value': streak}
+            for username, streak in rows
+        ]
+    
+    @classmethod
+    def record_day(cls, user, date):
+        """A day gained its first session (call inside transaction.atomic)"""
+        streak, _ = cls.objects.select_for_update().get_or_create(user=user)
+        last = streak.last_study_date
         
-        # Start from today and go backwards
-        while True:
-            has_studied = cls.objects.filter(user=user, date=current_date).exists()
-            if has_studied:
-                streak += 1
-            else:
-                # If this is today and no study yet, continue to yesterday
-                # This gives a "grace period" for the current day
-                if current_date == today:
-                    current_date -= timedelta(days=1)
-                    continue
-                # If it's any past day without study, streak is broken
-                else:
-                    break
-            
-            # Move to previous day
-            current_date -= timedelta(days=1)
+        if last is not None and date < last:
+            # Backfilled day in the past can merge older runs - recompute
+            return cls.rebuild(user)
         
+        if last is not None and date == last + timedelta(days=1):
+            streak.current_streak += 1
+        elif last != date:
+            streak.current_streak = 1
+        streak.last_study_date = date
+        streak.highest_streak = max(streak.highest_streak, streak.current_streak)
+        streak.save()
         return streak
     
     @classmethod
-    def get_highest_streak(cls, user):
-        """Calculate the highest streak ever achieved by the user"""
-        # Get all unique study dates for the user
-        study_dates = cls.objects.filter(user=user).values_list('date', flat=True).distinct().order_by('date')
+    def remove_day(cls, user, date):
+        """A day lost its last session (call inside transaction.atomic)"""
+        streak = cls.objects.select_for_update().filter(pk=user.pk).first()
+        if streak is None or streak.last_study_date is None:
+            return cls.rebuild(user)
+        
+        last = streak.last_study_date
+        run_start = last - timedelta(days=streak.current_streak - 1)
         
-        if not study_dates:
-            return 0
+        # Days outside the current run, or emptying a one-day run, need history
+        if date < run_start or date > last or streak.current_streak == 1:
+            return cls.rebuild(user)
+        # The highest streak may have been this run - recompute from history
+        if streak.current_streak == streak.highest_streak:
+            return cls.rebuild(user)
         
-        study_dates = list(study_dates)
-        max_streak = 1
-        current_streak = 1
+        if date == last:
+            streak.last_study_date = last - timedelta(days=1)
+            streak.current_streak -= 1
+        else:
+            # Split the run: only the days after the removed one remain current
+            streak.current_streak = (last - date).days
+        streak.save()
+        return streak
+    
+    @classmethod
+    def rebuild(cls, user):
+        """Recompute streak state for a user from their StudySession history"""
+        study_dates = list(
+            StudySession.objects.filter(user=user)
+            .order_by('date').values_list('date', flat=True).distinct()
+        )
         
-        # Iterate through dates and find longest consecutive streak
-        for i in range(1, len(study_dates)):
-            if study_dates[i] - study_dates[i-1] == timedelta(days=1):
-                current_streak += 1
-                max_streak = max(max_streak, current_streak)
+        highest = 0
+        run = 0
+        previous = None
+        for date in study_dates:
+            if previous is not None and date - previous == timedelta(days=1):
+                run += 1
             else:
-                current_streak = 1
+                run = 1
+            highest = max(highest, run)
+            previous = date
         
-        return max_streak
+        streak, _ = cls.objects.update_or_create(
+            user=user,
+            defaults={
+                'current_streak': run,
+                'highest_streak': highest,
+                'last_study_date': previous,
+            },
+        )
+        return streak
 
 
 # Assignment Model
@@ -142,6 +383,10 @@ class Assignment(models.Model):
         ('high', 'High'),
     ]
     
+    # Deadlines within this many days are high / medium urgency
+    HIGH_URGENCY_DAYS = 3
+    MEDIUM_URGENCY_DAYS = 7
+    
     PRIORITY_CHOICES = [
         ('low', 'Low'),
         ('normal', 'Normal'),
@@ -158,10 +403,16 @@ class Assignment(models.Model):
     urgency = models.CharField(max_length=20, choices=URGENCY_CHOICES, default='low')
     priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='normal')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         ordering = ['deadline', '-created_at']
+        indexes = [
+            # Covers the latest-change lookup behind the board ETag
+            models.Index(fields=['user', 'updated_at'], name='core_assignment_changed_idx'),
+            models.Index(fields=['user', 'status', 'deadline'], name='core_assignment_board_idx'),
+        ]
         
     def save(self, *args, **kwargs):
         """Override save to handle null deadlines"""
@@ -196,9 +447,9 @@ class Assignment(models.Model):
             return 'low'  # No deadline = low urgency
         if days < 0:
             return 'high'
-        elif days <= 3:
+        elif days <= self.HIGH_URGENCY_DAYS:
             return 'high'
-        elif days <= 7:
+        elif days <= self.MEDIUM_URGENCY_DAYS:
             return 'medium'
         else:
             return 'low'
@@ -250,9 +501,97 @@ class QuickNote(models.Model):
     
     class Meta:
         ordering = ['-is_pinned', '-pinned_at', '-created_at']
+        indexes = [
+            # Keyset pagination, see get_page. is_pinned is left out: SQLite can't seek
+            # on `NOT is_pinned`, and the few pinned notes are skipped during the scan
+            models.Index(fields=['user', '-updated_at', '-id'], name='core_note_feed_idx'),
+            models.Index(fields=['subject_folder', '-updated_at', '-id'], name='core_note_folder_feed_idx'),
+            # Partial indexes for the pinned strip (at most a few rows per folder)
+            models.Index(fields=['user', '-pinned_at'], condition=models.Q(is_pinned=True), name='core_note_pinned_idx'),
+            models.Index(fields=['subject_folder', '-pinned_at'], condition=models.Q(is_pinned=True), name='core_note_folder_pinned_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.title}"
+    
+    @property
+    def cursor(self):
+        """Opaque position of this note in the (updated_at, id) feed order"""
+        return make_cursor(self.updated_at, self.pk)
+    
+    @classmethod
+    def get_page(cls, user, folder=None, cursor=None, limit=24):
+        """
+        One page of unpinned notes, newest first, starting after `cursor`.
+        Returns (notes, next_cursor); raises ValueError for a malformed cursor.
+        """
+        notes = cls.objects.filter(user=user, is_pinned=False)
+        if folder is not None:
+            notes = notes.filter(subject_folder=folder)
+        
+        if cursor:
+            updated_at, note_id = parse_cursor(cursor)
+            # The redundant `lte` bound gives SQLite a range to seek on in the index
+            notes = notes.filter(updated_at__lte=updated_at).filter(
+                models.Q(updated_at__lt=updated_at) | models.Q(id__lt=note_id)
+            )
+        
+        notes = list(notes.order_by('-updated_at', '-id')[:limit + 1])
+        next_cursor = notes[limit - 1].cursor if len(notes) > limit else None
+        return notes[:limit], next_cursor
+    
+    @staticmethod
+    def _match_expression(query):
+        """Turn free text into an FTS5 query of quoted prefix terms (all must match)"""
+        terms = re.findall(r'\w+', query)[:8]
+        return ' '.join(f'"{term}"*' for term in terms)
+    
+    @classmethod
+    def search(cls, user, query, folder=None, limit=20, offset=0):
+        """
+        Ranked full-text search over a user's notes, optionally within one folder.
+        Returns (notes, has_more); each note carries a `snippet` of the matching text.
+        """
+        terms = cls._match_expression(query)
+        if not terms:
+            return [], False
+        
+        if connection.vendor != 'sqlite':
+            notes = cls.objects.filter(user=user).filter(
+                models.Q(title__icontains=query) | models.Q(content__icontains=query)
+            ).order_by('-updated_at')
+            if folder is not None:
+                notes = notes.filter(subject_folder=folder)
+            notes = list(notes[offset:offset + limit + 1])
+            for note in notes:
+                note.snippet = note.content[:160]
+            return notes[:limit], len(notes) > limit
+        
+        # Scope tokens are matched inside the index, see migration 0015
+        scope = f'scope:u{user.pk}'
+        if folder is not None:
+            scope += f' AND scope:f{folder.pk}'
+        match = f'{scope} AND {{title content}}: ({terms})'
+        
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT rowid, snippet(core_quicknote_fts, 1, char(2), char(3), '…', 16) "
+                "FROM core_quicknote_fts WHERE core_quicknote_fts MATCH %s "
+                "ORDER BY bm25(core_quicknote_fts, 10.0, 1.0, 0.0) LIMIT %s OFFSET %s",
+                [match, limit + 1, offset],
+            )
+            rows = cursor.fetchall()
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        found = cls.objects.select_related('subject_folder').in_bulk([row[0] for row in rows])
+        notes = []
+        for note_id, snippet in rows:
+            note = found.get(note_id)
+            if note is not None:
+                note.snippet = snippet
+                notes.append(note)
+        return notes, has_more
 
 
 # Support Message Model (for user-admin communication)
@@ -279,9 +618,341 @@ class SupportMessage(models.Model):
     admin_response = models.TextField(max_length=2000, blank=True, null=True)
     responded_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Delta sync by (updated_at, id) for either side of a conversation
+            models.Index(fields=['sender', 'updated_at', 'id'], name='core_msg_sender_sync_idx'),
+            models.Index(fields=['recipient', 'updated_at', 'id'], name='core_msg_recipient_sync_idx'),
+            # ... and across all messages for the admin inbox
+            models.Index(fields=['updated_at', 'id'], name='core_msg_sync_idx'),
+            # Admin inbox: the open queue per type, and everything newest first.
+            # is_resolved goes in the condition because Django filters it as
+            # `NOT is_resolved`, which can't seek a leading index column
+            models.Index(fields=['message_type', '-created_at'], condition=models.Q(is_resolved=False), name='core_msg_open_idx'),
+            models.Index(fields=['-created_at'], condition=models.Q(is_resolved=True), name='core_msg_resolved_idx'),
+            models.Index(fields=['-created_at'], name='core_msg_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.sender.username} - {self.subject}"
+    
+    @property
+    def cursor(self):
+        return make_cursor(self.updated_at, self.pk)
+    
+    @classmethod
+    def _visible_to(cls, user):
+        """The user's messages, or every message when `user` is None (admin inbox)"""
+        if user is None:
+            return cls.objects.all()
+        return cls.objects.filter(models.Q(sender=user) | models.Q(recipient=user))
+    
+    @staticmethod
+    def latest_cursor(messages):
+        """Cursor of the most recent change among loaded messages, to sync on from with changed_since"""
+        latest = max(messages, key=lambda message: (message.updated_at, message.pk), default=None)
+        return latest.cursor if latest else None
+    
+    @classmethod
+    def changed_since(cls, user, cursor=None, limit=50):
+        """
+        The user's messages (every message when `user` is None) created or updated
+        after `cursor`, oldest change first. Returns (messages, has_more); raises
+        ValueError for a malformed cursor.
+        """
+        messages = cls._visible_to(user).select_related('sender', 'recipient', 'study_session')
+        
+        if cursor:
+            updated_at, message_id = parse_cursor(cursor)
+            messages = messages.filter(updated_at__gte=updated_at).filter(
+                models.Q(updated_at__gt=updated_at) | models.Q(id__gt=message_id)
+            )
+        
+        messages = list(messages.order_by('updated_at', 'id')[:limit + 1])
+        return messages[:limit], len(messages) > limit
+
+
+# Report Job Model (queued admin PDF reports, built by the report worker)
+class ReportJob(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='report_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    progress = models.IntegerField(default=0, help_text="Percent complete")
+    file = models.FileField(upload_to='reports/', blank=True)
+    data_signature = models.CharField(max_length=64, blank=True, help_text="Fingerprint of the data the report was built from")
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Report #{self.pk} - {self.status} ({self.progress}%)"
+
+
+# Request Metric Model (per-view timings, flushed from each worker by core.metrics)
+class RequestMetric(models.Model):
+    url_name = models.CharField(max_length=200)
+    window_start = models.DateTimeField(help_text="Start of the hour these requests fall in")
+    request_count = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0, help_text="Responses with a 5xx status")
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    # Request counts per core.metrics.LATENCY_BUCKETS_MS bucket
+    histogram = models.JSONField(default=list)
+    query_count = models.IntegerField(default=0)
+    sql_ms = models.FloatField(default=0)
+    
+    class Meta:
+        ordering = ['-window_start', 'url_name']
+        unique_together = ['url_name', 'window_start']
+        indexes = [
+            models.Index(fields=['window_start'], name='core_metric_window_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.url_name} @ {self.window_start:%Y-%m-%d %H:00} - {self.request_count} requests"
+
+
+# Platform Daily Snapshot Model (filled by `python manage.py snapshot_platform_stats`)
+class PlatformDailySnapshot(models.Model):
+    date = models.DateField(unique=True)
+    taken_at = models.DateTimeField(help_text="When the totals below were counted")
+    # Totals as of the end of `date` (or taken_at for today)
+    total_users = models.IntegerField(default=0)
+    active_users = models.IntegerField(default=0, help_text="Users who logged in during the 7 days before")
+    total_sessions = models.IntegerField(default=0)
+    total_minutes = models.BigIntegerField(default=0)
+    todo_assignments = models.IntegerField(default=0)
+    in_progress_assignments = models.IntegerField(default=0)
+    pending_assignments = models.IntegerField(default=0)
+    completed_assignments = models.IntegerField(default=0)
+    total_notes = models.IntegerField(default=0)
+    # Activity on `date` itself
+    new_users = models.IntegerField(default=0)
+    studying_users = models.IntegerField(default=0)
+    day_sessions = models.IntegerField(default=0)
+    day_minutes = models.IntegerField(default=0)
+    # Highest ids counted above; newer rows are added live on top of the snapshot
+    last_user_id = models.IntegerField(default=0)
+    last_session_id = models.IntegerField(default=0)
+    last_assignment_id = models.IntegerField(default=0)
+    last_note_id = models.IntegerField(default=0)
+    
+    ASSIGNMENT_STATUS_FIELDS = {
+        'todo': 'todo_assignments',
+        'in_progress': 'in_progress_assignments',
+        'pending': 'pending_assignments',
+        'completed': 'completed_assignments',
+    }
+    
+    class Meta:
+        ordering = ['-date']
+    
+    def __str__(self):
+        return f"Platform snapshot {self.date} - {self.total_users} users, {self.total_sessions} sessions"
+    
+    @classmethod
+    def rebuild(cls, days=None):
+        """
+        Recount the snapshots for the last `days` days, or from the latest
+        snapshot through today. Call inside transaction.atomic(). Returns rows written.
+        """
+        now = timezone.now()
+        today = timezone.localdate(now)
+        if days is None:
+            start = cls.objects.values_list('date', flat=True).first() or today
+        else:
+            start = today - timedelta(days=days - 1)
+        dates = [start + timedelta(days=i) for i in range((today - start).days + 1)]
+        
+        # One grouped pass per table: rows before `start`, then per creation day
+        users = _running_totals(User.objects, 'date_joined', dates, total=models.Count('id'), last=models.Max('id'))
+        sessions = _running_totals(
+            StudySession.objects, 'created_at', dates,
+            total=models.Count('id'), minutes=models.Sum('duration'), last=models.Max('id'),
+        )
+        assignments = _running_totals(Assignment.objects, 'created_at', dates, last=models.Max('id'), **{
+            status: models.Count('id', filter=models.Q(status=status)) for status in cls.ASSIGNMENT_STATUS_FIELDS
+        })
+        notes = _running_totals(QuickNote.objects, 'created_at', dates, total=models.Count('id'), last=models.Max('id'))
+        activity = {
+            row.pop('date'): row
+            for row in DailyStudyTotal.objects.filter(date__gte=start, date__lte=today).order_by().values('date').annotate(
+                users=models.Count('id'),
+                sessions=models.Sum('session_count'),
+                minutes=models.Sum('minutes'),
+            )
+        }
+        
+        rows = []
+        previous_users = users['before']['total']
+        for date in dates:
+            end = min(now, timezone.make_aware(datetime.combine(date + timedelta(days=1), datetime.min.time())))
+            day = activity.get(date, {})
+            row = cls(
+                date=date,
+                taken_at=now,
+                total_users=users[date]['total'],
+                # last_login only keeps the latest login, so past days undercount
+                active_users=User.objects.filter(last_login__gt=end - timedelta(days=7), last_login__lte=end).count(),
+                total_sessions=sessions[date]['total'],
+                total_minutes=sessions[date]['minutes'],
+                total_notes=notes[date]['total'],
+                new_users=users[date]['total'] - previous_users,
+                studying_users=day.get('users', 0),
+                day_sessions=day.get('sessions') or 0,
+                day_minutes=day.get('minutes') or 0,
+                last_user_id=users[date]['last'],
+                last_session_id=sessions[date]['last'],
+                last_assignment_id=assignments[date]['last'],
+                last_note_id=notes[date]['last'],
+            )
+            for status, field in cls.ASSIGNMENT_STATUS_FIELDS.items():
+                setattr(row, field, assignments[date][status])
+            rows.append(row)
+            previous_users = users[date]['total']
+        
+        cls.objects.filter(date__in=dates).delete()
+        cls.objects.bulk_create(rows)
+        return len(rows)
+    
+    @classmethod
+    def current_totals(cls, snapshot=None):
+        """
+        Platform totals: the snapshot's counts plus rows created since it was
+        taken, read by primary-key range. Without a snapshot everything is counted.
+        Deleted users, sessions and notes drop out at the next snapshot.
+        Assignments change status in place, so they are always counted live.
+        """
+        snapshot = snapshot or cls(taken_at=timezone.now())
+        new_sessions = StudySession.objects.filter(id__gt=snapshot.last_session_id).aggregate(
+            total=models.Count('id'), minutes=models.Sum('duration'),
+        )
+        # A scan of the (user, status, deadline) board index, which covers status
+        assignments = Assignment.objects.aggregate(**{
+            status: models.Count('id', filter=models.Q(status=status)) for status in cls.ASSIGNMENT_STATUS_FIELDS
+        })
+        totals = {
+            'total_users': snapshot.total_users + User.objects.filter(id__gt=snapshot.last_user_id).count(),
+            'total_sessions': snapshot.total_sessions + new_sessions['total'],
+            'total_minutes': snapshot.total_minutes + (new_sessions['minutes'] or 0),
+            'total_notes': snapshot.total_notes + QuickNote.objects.filter(id__gt=snapshot.last_note_id).count(),
+        }
+        for status, field in cls.ASSIGNMENT_STATUS_FIELDS.items():
+            totals[field] = assignments[status]
+        totals['total_assignments'] = sum(totals[field] for field in cls.ASSIGNMENT_STATUS_FIELDS.values())
+        return totals
+
+
+# ========================================
+# QUERY HELPERS
+# ========================================
+
+def make_cursor(timestamp, pk):
+    """Opaque keyset pagination cursor for a (timestamp, id) position (URL-safe)"""
+    return f"{timestamp.astimezone(dt_timezone.utc).isoformat().replace('+00:00', 'Z')}_{pk}"
+
+
+def parse_cursor(cursor):
+    """Inverse of make_cursor; raises ValueError if the cursor is malformed"""
+    timestamp, _, pk = cursor.rpartition('_')
+    # fromisoformat() only accepts a trailing 'Z' from Python 3.11
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')), int(pk)
+
+
+def _running_totals(queryset, field, dates, **aggregates):
+    """
+    Aggregates over `queryset` as of the end of each of `dates` (consecutive days),
+    bucketed by the datetime `field`; Max aggregates keep the running maximum.
+    The totals before the first day are under 'before'.
+    """
+    since = timezone.make_aware(datetime.combine(dates[0], datetime.min.time()))
+    before = queryset.filter(**{f'{field}__lt': since}).aggregate(**aggregates)
+    per_day = {
+        row.pop('day'): row
+        for row in queryset.filter(**{f'{field}__gte': since}).annotate(day=TruncDate(field)).order_by().values(
+            'day'
+        ).annotate(**aggregates)
+    }
+    
+    running = {name: value or 0 for name, value in before.items()}
+    totals = {'before': dict(running)}
+    for date in dates:
+        for name, value in per_day.get(date, {}).items():
+            if isinstance(aggregates[name], models.Max):
+                running[name] = max(running[name], value or 0)
+            else:
+                running[name] += value or 0
+        totals[date] = dict(running)
+    return totals
+
+
+def user_total(model, aggregate):
+    """Correlated per-user aggregate over `model`, for annotating User querysets"""
+    return Coalesce(
+        Subquery(
+            model.objects.filter(user=OuterRef('pk')).order_by().values('user')
+            .annotate(total=aggregate).values('total')[:1]
+        ),
+        0,
+    )
+
+
+def annotate_user_stats(users):
+    """Annotate a User queryset with activity totals (constant query count, however many users)"""
+    return users.annotate(
+        study_minutes=user_total(StudySession, models.Sum('duration')),
+        assignment_count=user_total(Assignment, models.Count('id')),
+        completed_count=user_total(Assignment, models.Count('id', filter=models.Q(status='completed'))),
+        note_count=user_total(QuickNote, models.Count('id')),
+        folder_count=user_total(SubjectFolder, models.Count('id')),
+    )
+
+
+def annotate_assignment_urgency(assignments, now=None):
+    """
+    Annotate an Assignment queryset with live values that the stored `urgency` field
+    can't keep current. Adds `live_urgency` and `urgency_rank` (2 high, 1 medium, 0 low),
+    which use the same day thresholds as calculate_urgency. Also adds `time_left`
+    (deadline - now) and `days_left` (deadline date - today), both as timedeltas.
+    """
+    now = now or timezone.now()
+    today = now.date()
+    # A deadline is within N days when it falls before midnight starting day N + 1
+    high_before = datetime.combine(today + timedelta(days=Assignment.HIGH_URGENCY_DAYS + 1), datetime.min.time(), tzinfo=dt_timezone.utc)
+    medium_before = datetime.combine(today + timedelta(days=Assignment.MEDIUM_URGENCY_DAYS + 1), datetime.min.time(), tzinfo=dt_timezone.utc)
+    
+    return assignments.annotate(
+        live_urgency=models.Case(
+            models.When(deadline__lt=high_before, then=models.Value('high')),
+            models.When(deadline__lt=medium_before, then=models.Value('medium')),
+            default=models.Value('low'),
+            output_field=models.CharField(),
+        ),
+        urgency_rank=models.Case(
+            models.When(deadline__lt=high_before, then=models.Value(2)),
+            models.When(deadline__lt=medium_before, then=models.Value(1)),
+            default=models.Value(0),
+            output_field=models.IntegerField(),
+        ),
+        time_left=models.ExpressionWrapper(
+            F('deadline') - models.Value(now, output_field=models.DateTimeField()),
+            output_field=models.DurationField(),
+        ),
+        days_left=models.ExpressionWrapper(
+            TruncDate('deadline', tzinfo=dt_timezone.utc) - models.Value(today, output_field=models.DateField()),
+            output_field=models.DurationField(),
+        ),
+    )
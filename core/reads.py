@@ -0,0 +1,80 @@
+"""
+Concurrent read-only queries for the async dashboard views.
+
+Django's async ORM runs every query on one shared thread, one after another, so
+gathering it gains nothing. gather_reads() instead runs each call on a pool
+thread. Each thread has its own connection, routed to the read-only database
+alias, and SQLite in WAL mode serves those readers in parallel. SQLite releases
+the GIL while it executes, so on a multi-core host a page waits about as long as
+its slowest query rather than the sum of all of them. The ORM's Python-side work
+still runs one thread at a time.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+
+from .metrics import current_sql_timer
+
+READ_DATABASE = 'readonly'
+
+_executor = (
+    ThreadPoolExecutor(max_workers=settings.CONCURRENT_READ_WORKERS, thread_name_prefix='focus-read')
+    if settings.CONCURRENT_READ_WORKERS else None
+)
+_routing = threading.local()
+
+
+class ReadRouter:
+    """Sends reads made inside gather_reads() to the read-only alias"""
+
+    def db_for_read(self, model, **hints):
+        return getattr(_routing, 'alias', None)
+
+    def db_for_write(self, model, **hints):
+        # Rows loaded through the read-only alias are still saved through default
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db == READ_DATABASE:
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        return False if db == READ_DATABASE else None
+
+
+def _read_alias():
+    return READ_DATABASE if READ_DATABASE in settings.DATABASES else DEFAULT_DB_ALIAS
+
+
+def _run_read(func):
+    # Pool threads outlive requests, so apply CONN_MAX_AGE the way a request would
+    close_old_connections()
+    _routing.alias = _read_alias()
+    try:
+        with ExitStack() as stack:
+            # Count these queries towards the request that asked for them
+            timer = current_sql_timer.get()
+            if timer is not None:
+                timer.wrap_connections(stack)
+            return func()
+    finally:
+        del _routing.alias
+        close_old_connections()
+
+
+async def gather_reads(*funcs):
+    """
+    Run independent read-only callables concurrently and return their results
+    in order. Each must finish its queries itself (e.g. list() a queryset).
+    """
+    # Asked on the request's own thread, where its connection lives. Other
+    # connections can't see an open transaction's uncommitted rows.
+    if _executor is None or await sync_to_async(lambda: connections[DEFAULT_DB_ALIAS].in_atomic_block)():
+        return await sync_to_async(lambda: [func() for func in funcs])()
+    return await asyncio.gather(*(
+        sync_to_async(_run_read, thread_sensitive=False, executor=_executor)(func) for func in funcs
+    ))
@@ -0,0 +1,335 @@
+"""
+Admin PDF activity report: queued jobs built by a local worker process.
+
+The admin panel enqueues a ReportJob; `python manage.py run_report_worker`
+builds the PDF into MEDIA_ROOT/reports/ and records progress on the job.
+When nothing changed since the last finished report, that report is reused.
+"""
+import hashlib
+import json
+import subprocess
+import sys
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.db import models, transaction
+from django.utils import timezone
+
+from .models import (
+    Assignment, PlatformDailySnapshot, QuickNote, ReportJob, StudySession, SubjectFolder, annotate_user_stats, user_total,
+)
+
+# In-flight jobs older than this are treated as abandoned by a crashed worker
+STALE_JOB_AGE = timedelta(minutes=30)
+
+# Finished report files kept on disk
+KEEP_REPORTS = 5
+
+
+def report_data_signature():
+    """Fingerprint of the data a report covers (a handful of aggregate queries)"""
+    parts = [
+        User.objects.aggregate(
+            n=models.Count('id'),
+            last=models.Max('id'),
+            active=models.Count('id', filter=models.Q(is_active=True)),
+            admins=models.Count('id', filter=models.Q(is_superuser=True)),
+        ),
+        StudySession.objects.aggregate(
+            n=models.Count('id'),
+            last=models.Max('id'),
+            minutes=models.Sum('duration'),
+            subjects=models.Count('subject', distinct=True),
+        ),
+        Assignment.objects.aggregate(
+            n=models.Count('id'),
+            last=models.Max('id'),
+            pending=models.Count('id', filter=models.Q(status='pending')),
+            completed=models.Count('id', filter=models.Q(status='completed')),
+        ),
+        QuickNote.objects.aggregate(n=models.Count('id'), last=models.Max('id')),
+        SubjectFolder.objects.aggregate(n=models.Count('id'), last=models.Max('id')),
+    ]
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def enqueue_report(user):
+    """
+    Return a job for an up-to-date report: the last finished one if the data
+    is unchanged, an in-flight one, or a newly queued job.
+    """
+    signature = report_data_signature()
+
+    latest = ReportJob.objects.filter(status='done').exclude(file='').first()
+    if latest and latest.data_signature == signature and latest.file.storage.exists(latest.file.name):
+        return latest
+
+    in_flight = ReportJob.objects.filter(
+        status__in=['queued', 'running'],
+        created_at__gte=timezone.now() - STALE_JOB_AGE,
+    ).first()
+    if in_flight:
+        return in_flight
+
+    job = ReportJob.objects.create(requested_by=user, data_signature=signature)
+    if settings.REPORT_WORKER_AUTOSTART:
+        start_worker()
+    return job
+
+
+def start_worker():
+    """Spawn a detached local worker that drains the queue and exits"""
+    subprocess.Popen(
+        [sys.executable, str(settings.BASE_DIR / 'manage.py'), 'run_report_worker', '--once'],
+        cwd=str(settings.BASE_DIR),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def claim_next_job():
+    """Atomically move the oldest queued job to running; None when the queue is empty"""
+    for job in ReportJob.objects.filter(status='queued').order_by('created_at')[:5]:
+        claimed = ReportJob.objects.filter(pk=job.pk, status='queued').update(
+            status='running', started_at=timezone.now(), progress=0
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def run_job(job):
+    """Build the PDF for a claimed job and store it under MEDIA_ROOT"""
+    def set_progress(percent):
+        ReportJob.objects.filter(pk=job.pk).update(progress=percent)
+
+    try:
+        # Fingerprint before reading so a concurrent change forces a rebuild next time
+        signature = report_data_signature()
+        pdf = build_activity_report(progress=set_progress)
+        job.file.save(f'FOCUS_User_Report_{timezone.now().strftime("%Y%m%d_%H%M%S")}.pdf', ContentFile(pdf), save=False)
+        job.data_signature = signature
+        job.status = 'done'
+        job.progress = 100
+    except Exception as e:
+        job.status = 'failed'
+        job.error = str(e)
+    job.finished_at = timezone.now()
+    job.save()
+    cleanup_old_reports()
+    return job
+
+
+def cleanup_old_reports():
+    """Delete report files beyond the newest KEEP_REPORTS"""
+    for old in ReportJob.objects.filter(status='done').exclude(file='')[KEEP_REPORTS:]:
+        old.file.delete(save=False)
+        old.save(update_fields=['file'])
+
+
+def build_activity_report(progress=None):
+    """Render the user activity report and return the PDF bytes"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+    from reportlab.lib.enums import TA_CENTER
+
+    buffer = BytesIO()
+
+    # Create the PDF document
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=landscape(A4),
+        rightMargin=30,
+        leftMargin=30,
+        topMargin=30,
+        bottomMargin=30
+    )
+
+    # Container for the PDF elements
+    elements = []
+
+    # Get styles
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor('#6699BB')
+    )
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=12,
+        spaceBefore=20,
+        textColor=colors.HexColor('#333333')
+    )
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=6
+    )
+
+    # Title
+    elements.append(Paragraph('FOCUS - User Activity Report', title_style))
+    elements.append(Paragraph(f'Generated on: {timezone.now().strftime("%B %d, %Y at %H:%M")}', normal_style))
+    elements.append(Spacer(1, 20))
+
+    # Platform Statistics
+    elements.append(Paragraph('Platform Overview', heading_style))
+
+    # Recount today's snapshot first: a snapshot misses deletes made since it was
+    # taken, and these totals must agree with the per-user rows below
+    with transaction.atomic():
+        PlatformDailySnapshot.rebuild(days=1)
+    totals = PlatformDailySnapshot.current_totals(PlatformDailySnapshot.objects.first())
+
+    stats_data = [
+        ['Metric', 'Value'],
+        ['Total Users', str(totals['total_users'])],
+        ['Total Study Sessions', str(totals['total_sessions'])],
+        ['Total Study Time', f"{round(totals['total_minutes'] / 60, 1)} hours"],
+        ['Total Assignments', str(totals['total_assignments'])],
+        ['Total Notes', str(totals['total_notes'])],
+    ]
+
+    stats_table = Table(stats_data, colWidths=[200, 150])
+    stats_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#6699BB')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f5f5f5')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dddddd')),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('TOPPADDING', (0, 1), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+    ]))
+    elements.append(stats_table)
+    elements.append(Spacer(1, 30))
+
+    # Per-user totals in one annotated query, subject totals in one grouped query
+    users = list(
+        annotate_user_stats(User.objects.all()).annotate(
+            pending_count=user_total(Assignment, models.Count('id', filter=models.Q(status='pending'))),
+        ).order_by('-date_joined')
+    )
+    subject_totals = {}
+    subject_rows = StudySession.objects.order_by().values('user_id', 'subject').annotate(
+        total=models.Sum('duration')
+    ).values_list('user_id', 'subject', 'total')
+    for user_id, subject, minutes in subject_rows:
+        subject_totals.setdefault(user_id, []).append((subject, minutes))
+
+    if progress:
+        progress(10)
+
+    # All Users Summary Table
+    elements.append(Paragraph('All Users Summary', heading_style))
+
+    user_data = [['Username', 'Email', 'Status', 'Role', 'Study Time', 'Assignments', 'Notes', 'Joined']]
+
+    for user in users:
+        user_data.append([
+            user.username,
+            user.email or 'N/A',
+            'Active' if user.is_active else 'Disabled',
+            'Admin' if user.is_superuser else 'User',
+            f'{round(user.study_minutes / 60, 1)}h',
+            str(user.assignment_count),
+            str(user.note_count),
+            user.date_joined.strftime('%Y-%m-%d')
+        ])
+
+    user_table = Table(user_data, colWidths=[80, 120, 60, 50, 70, 70, 50, 80])
+    user_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#669977')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f9f9f9')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dddddd')),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('TOPPADDING', (0, 1), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
+    ]))
+    elements.append(user_table)
+
+    # Individual User Details
+    elements.append(PageBreak())
+    elements.append(Paragraph('Individual User Details', title_style))
+
+    last_reported = 10
+    for index, user in enumerate(users, start=1):
+        elements.append(Paragraph(f'User: {user.username}', heading_style))
+
+        # User info
+        info_text = f"Email: {user.email or 'N/A'} | Status: {'Active' if user.is_active else 'Disabled'} | "
+        info_text += f"Role: {'Administrator' if user.is_superuser else 'Regular User'} | "
+        info_text += f"Joined: {user.date_joined.strftime('%B %d, %Y')}"
+        elements.append(Paragraph(info_text, normal_style))
+
+        # Subject breakdown
+        user_subjects = subject_totals.get(user.id)
+        if user_subjects:
+            elements.append(Paragraph('Study Time by Subject:', normal_style))
+            subject_data = [['Subject', 'Time Studied']]
+            for subject, minutes in sorted(user_subjects, key=lambda x: x[1], reverse=True):
+                subject_data.append([subject, f'{round(minutes / 60, 1)} hours ({minutes} min)'])
+            subject_data.append(['TOTAL', f'{round(user.study_minutes / 60, 1)} hours'])
+
+            subject_table = Table(subject_data, colWidths=[200, 150])
+            subject_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#CCBB66')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#dddddd')),
+                ('TOPPADDING', (0, 0), (-1, -1), 5),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+                ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e8e8e8')),
+                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ]))
+            elements.append(subject_table)
+        else:
+            elements.append(Paragraph('No study sessions recorded.', normal_style))
+
+        # Assignments
+        elements.append(Paragraph(f'Assignments: {user.pending_count} pending, {user.completed_count} completed', normal_style))
+
+        # Notes
+        elements.append(Paragraph(f'Notes: {user.note_count} notes in {user.folder_count} folders', normal_style))
+
+        elements.append(Spacer(1, 20))
+
+        # Laying out the elements takes the rest; report in 5% steps
+        if progress:
+            percent = 10 + int(60 * index / len(users))
+            if percent - last_reported >= 5:
+                progress(percent)
+                last_reported = percent
+
+    # Build the PDF
+    doc.build(elements)
+    if progress:
+        progress(95)
+
+    pdf = buffer.getvalue()
+    buffer.close()
+    return pdf
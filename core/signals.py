@@ -0,0 +1,95 @@
+"""
+Signal handlers that keep cached counters and live event streams in step with
+model changes, tune new database connections and flush request metrics.
+"""
+import re
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import request_finished
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from . import events
+from .auth import forget_cached_user
+from .caching import adjust_unresolved_message_count
+from .metrics import recorder
+from .models import SupportMessage
+
+
+def _is_unresolved(message):
+    # Read the loaded value directly so deferred fields don't trigger a query
+    return message.__dict__.get('is_resolved') is False
+
+
+@receiver(post_init, sender=SupportMessage)
+def remember_resolved_state(sender, instance, **kwargs):
+    instance._was_unresolved = bool(instance.pk) and _is_unresolved(instance)
+
+
+@receiver(post_save, sender=SupportMessage)
+def update_unresolved_count_on_save(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and 'is_resolved' not in update_fields:
+        return
+    now_unresolved = _is_unresolved(instance)
+    was_unresolved = False if created else instance._was_unresolved
+    if now_unresolved != was_unresolved:
+        adjust_unresolved_message_count(1 if now_unresolved else -1)
+    instance._was_unresolved = now_unresolved
+
+
+@receiver(post_delete, sender=SupportMessage)
+def update_unresolved_count_on_delete(sender, instance, **kwargs):
+    if instance._was_unresolved:
+        adjust_unresolved_message_count(-1)
+
+
+def _publish_message_event(message, action):
+    channels = [events.ADMIN_CHANNEL, events.user_channel(message.sender_id)]
+    if message.recipient_id and message.recipient_id != message.sender_id:
+        channels.append(events.user_channel(message.recipient_id))
+    events.publish(channels, {
+        'action': action,
+        'id': message.pk,
+        'sender_id': message.sender_id,
+        'is_resolved': message.is_resolved,
+        'has_response': bool(message.admin_response),
+    })
+
+
+@receiver(post_save, sender=SupportMessage)
+def push_message_saved(sender, instance, created, **kwargs):
+    _publish_message_event(instance, 'created' if created else 'updated')
+
+
+@receiver(post_delete, sender=SupportMessage)
+def push_message_deleted(sender, instance, **kwargs):
+    _publish_message_event(instance, 'deleted')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Covers disabling, deleting and password changes (and last_login on each login)
+    forget_cached_user(instance.pk)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply settings.SQLITE_PRAGMAS to each new SQLite connection"""
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        # PRAGMA values can't be bound as parameters, so only plain words and numbers pass
+        if not re.fullmatch(r'-?\w+', str(value)):
+            raise ImproperlyConfigured(f'Invalid SQLite PRAGMA value for {name}: {value!r}')
+        # The raw connection keeps this out of query logs and execute wrappers
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(request_finished)
+def flush_request_metrics(sender, **kwargs):
+    # Sent once the response has been delivered, so the database write never delays a client
+    recorder.flush_if_due()
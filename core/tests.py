@@ -1,3 +1,1039 @@
-from django.test import TestCase
+import gc
+import json
+import math
+import os
+import random
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import SESSION_KEY
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.core.signals import request_finished
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.backends.signals import connection_created
+from django.db.models import Count, Sum
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+from . import urls
+from .caching import UNRESOLVED_COUNT_KEY, get_unresolved_message_count
+from .metrics import MetricsMiddleware, recorder
+from .reports import build_activity_report
+from .models import (
+    Assignment, DailyStudyTotal, MonthlyStudyTotal, PlatformDailySnapshot, QuickNote, ReportJob, RequestMetric,
+    StudySession, SubjectFolder, SupportMessage, UserStreak, make_cursor, parse_cursor,
+)
+
+# "SCAN <table>" with no "USING ... INDEX" is a full table scan
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+
+class QueryPlanTests(TestCase):
+    """Every SELECT issued by the main views must be served by an index"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='pass')
+        cls.admin = User.objects.create_superuser('admin', password='pass')
+        cls.folder = SubjectFolder.objects.create(user=cls.user, name='Math')
+        now = timezone.now()
+        for i in range(3):
+            session = StudySession.objects.create(user=cls.user, subject='Math', duration=25, date=now.date() - timedelta(days=i))
+            DailyStudyTotal.apply_delta(cls.user, session.date, minutes=session.duration, sessions=1)
+            Assignment.objects.create(user=cls.user, title=f'Task {i}', deadline=now + timedelta(days=i))
+            QuickNote.objects.create(
+                user=cls.user, subject_folder=cls.folder, subject='Math',
+                title=f'Note {i}', content='limits and derivatives', is_pinned=(i == 0),
+            )
+            SupportMessage.objects.create(sender=cls.user, recipient=cls.admin, subject='Help', content='Question')
+
+    def setUp(self):
+        cache.clear()
+
+    def assertNoFullScans(self, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200, url)
+
+        for query in queries.captured_queries:
+            if not query['sql'].startswith('SELECT'):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                plan = [row[-1] for row in cursor.fetchall()]
+            scans = [step for step in plan if FULL_SCAN.match(step)]
+            self.assertFalse(scans, f"{url} scans a full table: {query['sql']}")
+
+    def test_user_views(self):
+        self.client.force_login(self.user)
+        self.assertNoFullScans(reverse('dashboard'))
+        self.assertNoFullScans(reverse('get_dashboard_stats'))
+        self.assertNoFullScans(reverse('study'))
+        self.assertNoFullScans(reverse('get_today_study_time'))
+        self.assertNoFullScans(reverse('assignments'))
+        self.assertNoFullScans(reverse('assignment_board'))
+        self.assertNoFullScans(reverse('support'))
+        self.assertNoFullScans(reverse('get_user_messages'))
+
+    def test_notes_views(self):
+        self.client.force_login(self.user)
+        self.assertNoFullScans(reverse('notes'))
+        self.assertNoFullScans(reverse('notes'), {'folder': self.folder.pk})
+        cursor = QuickNote.objects.filter(is_pinned=False).latest('updated_at').cursor
+        self.assertNoFullScans(reverse('list_notes'), {'cursor': cursor})
+        self.assertNoFullScans(reverse('search_notes'), {'q': 'deriv'})
+
+    def test_admin_message_inbox(self):
+        self.client.force_login(self.admin)
+        self.assertNoFullScans(reverse('admin_messages'))
+        self.assertNoFullScans(reverse('admin_message_changes'))
+        cursor = SupportMessage.objects.earliest('updated_at').cursor
+        self.assertNoFullScans(reverse('admin_message_changes'), {'since': cursor})
+
+
+class StudySessionWriteTests(TestCase):
+    """Saving sessions keeps the daily and monthly rollups equal to the raw session rows"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='pass')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def assertRollupsMatchSessions(self):
+        minutes = StudySession.objects.filter(user=self.user).aggregate(total=Sum('duration'))['total'] or 0
+        self.assertEqual(DailyStudyTotal.objects.filter(user=self.user).aggregate(total=Sum('minutes'))['total'] or 0, minutes)
+        self.assertEqual(MonthlyStudyTotal.objects.filter(user=self.user).aggregate(total=Sum('minutes'))['total'] or 0, minutes)
+
+    def save(self, duration):
+        return self.client.post(
+            reverse('save_study_session'), {'subject': 'Math', 'duration': duration}, content_type='application/json',
+        )
+
+    def test_fractional_duration_is_stored_as_whole_minutes(self):
+        for duration in [25.5, 30, 24.9]:
+            self.assertEqual(self.save(duration).status_code, 200)
+        self.assertEqual(self.save(25.5).json()['today_total_minutes'], 104)
+        self.assertRollupsMatchSessions()
+
+    def test_invalid_duration_is_rejected(self):
+        for duration in ['abc', '24.9', -5, 0.4, [25]]:
+            self.assertEqual(self.save(duration).status_code, 400, duration)
+        self.assertFalse(StudySession.objects.exists())
+        self.assertRollupsMatchSessions()
+
+
+class SessionBatchTests(TestCase):
+    """Queued sessions are saved once each, and the rollups grow by exactly what was inserted"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='pass')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def upload(self, *sessions):
+        response = self.client.post(
+            reverse('save_study_sessions_batch'), {'sessions': list(sessions)}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def session(self, client_id, duration=25, days_ago=0):
+        ended_at = timezone.now() - timedelta(days=days_ago)
+        return {'client_id': client_id, 'subject': 'Math', 'duration': duration, 'ended_at': ended_at.isoformat()}
+
+    def assertRollupsMatchSessions(self):
+        sessions = StudySession.objects.filter(user=self.user)
+        days = {
+            row['date']: (row['minutes'], row['count'])
+            for row in sessions.values('date').annotate(minutes=Sum('duration'), count=Count('id'))
+        }
+        self.assertEqual(
+            {row.date: (row.minutes, row.session_count) for row in DailyStudyTotal.objects.filter(user=self.user)},
+            days,
+        )
+        months = {}
+        for date, (minutes, count) in days.items():
+            total = months.get(date.replace(day=1), (0, 0))
+            months[date.replace(day=1)] = (total[0] + minutes, total[1] + count)
+        self.assertEqual(
+            {row.month: (row.minutes, row.session_count) for row in MonthlyStudyTotal.objects.filter(user=self.user)},
+            months,
+        )
+
+    def test_retried_batch_skips_recorded_sessions(self):
+        batch = [self.session('a', 25), self.session('b', 40, days_ago=3), self.session('c', 15, days_ago=20)]
+        self.assertEqual(self.upload(*batch)['accepted'], ['a', 'b', 'c'])
+
+        result = self.upload(*batch, self.session('d', 30, days_ago=3))
+        self.assertEqual(result['accepted'], ['d'])
+        self.assertEqual(result['duplicates'], ['a', 'b', 'c'])
+        self.assertEqual(result['today_total_minutes'], 25)
+        self.assertEqual(StudySession.objects.filter(user=self.user).count(), 4)
+        self.assertRollupsMatchSessions()
+
+    def test_duplicate_client_id_within_a_batch_is_saved_once(self):
+        result = self.upload(self.session('a', 25), self.session('a', 50))
+        self.assertEqual((result['accepted'], result['today_total_minutes']), (['a'], 25))
+        self.assertRollupsMatchSessions()
+
+    def test_invalid_entries_are_rejected_individually(self):
+        result = self.upload(
+            self.session('ok', 25),
+            self.session('', 25),
+            self.session('zero', 0),
+            self.session('flag', True),
+            self.session('old', 25, days_ago=45),
+            {**self.session('blank'), 'subject': ' '},
+            'not an object',
+        )
+        self.assertEqual(result['accepted'], ['ok'])
+        self.assertEqual(
+            [entry['client_id'] for entry in result['rejected']], ['', 'zero', 'flag', 'old', 'blank', None],
+        )
+        self.assertEqual(StudySession.objects.filter(user=self.user).count(), 1)
+        self.assertRollupsMatchSessions()
+
+
+class UserStreakTests(TestCase):
+    """Incremental streak updates agree with a rebuild from the session history"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='pass')
+        cls.today = timezone.now().date()
+
+    def day(self, offset):
+        return self.today - timedelta(days=offset)
+
+    def add(self, offset):
+        with transaction.atomic():
+            session = StudySession.objects.create(user=self.user, subject='Math', duration=25, date=self.day(offset))
+            DailyStudyTotal.apply_delta(self.user, session.date, minutes=session.duration, sessions=1)
+
+    def delete(self, offset):
+        with transaction.atomic():
+            session = StudySession.objects.filter(user=self.user, date=self.day(offset)).first()
+            session.delete()
+            DailyStudyTotal.apply_delta(self.user, session.date, minutes=-session.duration, sessions=-1)
+
+    def assertMatchesRebuild(self, msg=None):
+        streak = UserStreak.objects.get(user=self.user)
+        incremental = (streak.current_streak, streak.highest_streak, streak.last_study_date)
+        rebuilt = UserStreak.rebuild(self.user)
+        self.assertEqual(incremental, (rebuilt.current_streak, rebuilt.highest_streak, rebuilt.last_study_date), msg)
+
+    def test_adding_days(self):
+        for offset in [6, 5, 4, 2, 1, 1, 0]:
+            self.add(offset)
+            self.assertMatchesRebuild(offset)
+        self.assertEqual(UserStreak.objects.get(user=self.user).current_streak, 3)
+
+    def test_deleting_days(self):
+        for offset in range(8, -1, -1):
+            self.add(offset)
+        self.add(4)
+        # A day with two sessions, the middle of the run, its end, its start, and the rest
+        for offset in [4, 4, 0, 8, 2, 7, 1, 3, 5, 6]:
+            self.delete(offset)
+            self.assertMatchesRebuild(offset)
+        self.assertEqual(UserStreak.objects.get(user=self.user).last_study_date, None)
+
+    def test_backfilling_days(self):
+        for offset in [0, 1, 5, 6, 9]:
+            self.add(offset)
+        # Filling the gaps joins the older runs onto the current one
+        for offset in [3, 8, 2, 4, 7, 12]:
+            self.add(offset)
+            self.assertMatchesRebuild(offset)
+        self.assertEqual(UserStreak.objects.get(user=self.user).current_streak, 10)
+
+    def test_random_sequence(self):
+        rng = random.Random(2)
+        for step in range(200):
+            offset = rng.randrange(15)
+            if rng.random() < 0.4 and StudySession.objects.filter(user=self.user, date=self.day(offset)).exists():
+                self.delete(offset)
+            else:
+                self.add(offset)
+            self.assertMatchesRebuild(step)
+
+    def test_rebuild_command_repairs_every_rollup(self):
+        for offset in [2, 1, 0]:
+            StudySession.objects.create(user=self.user, subject='Math', duration=25, date=self.day(offset))
+        call_command('rebuild_study_totals', user='student', stdout=StringIO())
+
+        self.assertEqual(DailyStudyTotal.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(
+            MonthlyStudyTotal.objects.filter(user=self.user).aggregate(total=Sum('minutes'))['total'], 75
+        )
+        self.assertEqual(UserStreak.objects.get(user=self.user).current_streak, 3)
+
+
+class NoteSearchTests(TestCase):
+    """The FTS index only ever matches the searching user's notes and follows every edit"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Ids 1 and 11 check that scope tokens are compared whole, not by prefix
+        cls.alice = User.objects.create_user('alice', password='pass', id=1)
+        cls.bob = User.objects.create_user('bob', password='pass', id=11)
+        cls.alice_folder = SubjectFolder.objects.create(user=cls.alice, name='Calculus', id=1)
+        cls.bob_folder = SubjectFolder.objects.create(user=cls.bob, name='Calculus', id=11)
+        cls.alice_note = QuickNote.objects.create(
+            user=cls.alice, subject_folder=cls.alice_folder, subject='Calculus', title='Limits', content='epsilon delta proofs',
+        )
+        cls.alice_loose = QuickNote.objects.create(user=cls.alice, subject='Calculus', content='limits of sequences')
+        cls.bob_note = QuickNote.objects.create(
+            user=cls.bob, subject_folder=cls.bob_folder, subject='Calculus', title='Limits', content='epsilon delta proofs',
+        )
+        # Scope words typed into a note must not widen anyone's search
+        cls.bob_spoof = QuickNote.objects.create(user=cls.bob, subject='Calculus', content='limits u1 f1 scope u1')
+
+    def found(self, user, query, folder=None):
+        notes, _ = QuickNote.search(user, query, folder=folder)
+        return {note.pk for note in notes}
+
+    def test_users_only_match_their_own_notes(self):
+        self.assertEqual(self.found(self.alice, 'limits'), {self.alice_note.pk, self.alice_loose.pk})
+        self.assertEqual(self.found(self.bob, 'limits'), {self.bob_note.pk, self.bob_spoof.pk})
+        self.assertEqual(self.found(self.alice, 'epsilon delta'), {self.alice_note.pk})
+        self.assertEqual(self.found(self.alice, 'u1'), set())
+
+    def test_folder_scope(self):
+        self.assertEqual(self.found(self.alice, 'limits', self.alice_folder), {self.alice_note.pk})
+        self.assertEqual(self.found(self.bob, 'limits', self.bob_folder), {self.bob_note.pk})
+        self.assertEqual(self.found(self.alice, 'limits', self.bob_folder), set())
+
+        self.client.force_login(self.alice)
+        response = self.client.get(reverse('search_notes'), {'q': 'limits', 'folder': self.bob_folder.pk})
+        self.assertEqual(response.status_code, 404)
+
+    def test_index_follows_edits_and_deletes(self):
+        note = self.alice_note
+        note.title = 'Derivatives'
+        note.content = 'chain rule'
+        note.save()
+        self.assertEqual(self.found(self.alice, 'epsilon'), set())
+        self.assertEqual(self.found(self.alice, 'chain', self.alice_folder), {note.pk})
+
+        # Triggers also catch queryset updates, which send no signals
+        QuickNote.objects.filter(pk=self.alice_loose.pk).update(subject_folder=self.alice_folder)
+        self.assertEqual(self.found(self.alice, 'sequences', self.alice_folder), {self.alice_loose.pk})
+
+        note.delete()
+        QuickNote.objects.filter(pk=self.alice_loose.pk).delete()
+        self.assertEqual(self.found(self.alice, 'chain'), set())
+        self.assertEqual(self.found(self.alice, 'limits'), set())
+        self.assertEqual(self.found(self.bob, 'epsilon'), {self.bob_note.pk})
+
+
+class MessageCursorTests(TestCase):
+    """get_user_messages pages through changes with a (updated_at, id) cursor"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='pass')
+        cls.other = User.objects.create_user('other', password='pass')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def sync(self, since=None):
+        params = {'since': since} if since else {}
+        response = self.client.get(reverse('get_user_messages'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cursor_round_trip(self):
+        local = datetime(2026, 3, 29, 1, 30, 15, 123456, tzinfo=dt_timezone(timedelta(hours=5, minutes=30)))
+        cursor = make_cursor(local, 42)
+        self.assertEqual(cursor, '2026-03-28T20:00:15.123456Z_42')
+        self.assertEqual(parse_cursor(cursor), (local, 42))
+
+        for bad in ['', 'nonsense', '2026-03-28T20:00:15Z', '2026-03-28T20:00:15Z_x']:
+            with self.assertRaises(ValueError):
+                parse_cursor(bad)
+        response = self.client.get(reverse('get_user_messages'), {'since': 'nonsense'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_utc_cursor_string_parses_without_z_support(self):
+        class StrictDatetime(datetime):
+            # fromisoformat() before Python 3.11 rejects a trailing 'Z'
+            @classmethod
+            def fromisoformat(cls, value):
+                if value.endswith('Z'):
+                    raise ValueError(f'Invalid isoformat string: {value!r}')
+                return super().fromisoformat(value)
+
+        cursor = '2026-03-28T20:00:15.123456Z_42'
+        with mock.patch('core.models.datetime', StrictDatetime):
+            timestamp, pk = parse_cursor(cursor)
+        self.assertEqual((timestamp, pk), (datetime(2026, 3, 28, 20, 0, 15, 123456, tzinfo=dt_timezone.utc), 42))
+        self.assertEqual(make_cursor(timestamp, pk), cursor)
+
+    def test_paging_through_equal_timestamps(self):
+        mine = [SupportMessage.objects.create(sender=self.user, subject=f'Question {i}', content='?') for i in range(5)]
+        SupportMessage.objects.create(sender=self.other, subject='Not yours', content='?')
+        # One shared timestamp, so only the id tie-breaker orders the pages
+        SupportMessage.objects.update(updated_at=timezone.now() - timedelta(minutes=5))
+
+        seen = []
+        cursor = None
+        with mock.patch('core.views.USER_MESSAGES_PAGE_SIZE', 2):
+            while True:
+                page = self.sync(cursor)
+                self.assertTrue(page['next_cursor'].split('_')[0].endswith('Z'))
+                seen += [message['id'] for message in page['messages']]
+                cursor = page['next_cursor']
+                if not page['has_more']:
+                    break
+            self.assertEqual(seen, [message.pk for message in mine])
+
+            # Caught up: nothing new until a message changes
+            self.assertEqual(self.sync(cursor)['messages'], [])
+            mine[1].is_read = True
+            mine[1].save()
+            page = self.sync(cursor)
+            self.assertEqual([message['id'] for message in page['messages']], [mine[1].pk])
+
+
+class UnresolvedCountTests(TestCase):
+    """The cached unresolved-message counter follows every change once it commits"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='pass')
+
+    def setUp(self):
+        cache.clear()
+        SupportMessage.objects.create(sender=self.user, subject='Existing', content='?')
+        self.assertEqual(get_unresolved_message_count(), 1)
+
+    def assertCountMatches(self):
+        # Read the cache directly: a miss would recount and hide a drifting counter
+        self.assertEqual(cache.get(UNRESOLVED_COUNT_KEY), SupportMessage.objects.filter(is_resolved=False).count())
+
+    def change(self, func):
+        with self.captureOnCommitCallbacks(execute=True):
+            func()
+        self.assertCountMatches()
+
+    def test_counter_tracks_changes(self):
+        def create(**kwargs):
+            with self.captureOnCommitCallbacks(execute=True):
+                message = SupportMessage.objects.create(sender=self.user, subject='Help', content='?', **kwargs)
+            self.assertCountMatches()
+            return message
+
+        first = create()
+        second = create()
+        create(is_resolved=True)
+
+        def resolve(message, resolved, **kwargs):
+            message.is_resolved = resolved
+            message.save(**kwargs)
+
+        self.change(lambda: resolve(first, True))
+        self.change(lambda: resolve(first, True))
+        self.change(lambda: resolve(first, False, update_fields=['is_resolved']))
+        # Saves that leave is_resolved out don't touch the counter
+        self.change(lambda: resolve(second, True, update_fields=['subject']))
+        self.change(lambda: resolve(SupportMessage.objects.get(pk=second.pk), True))
+
+        self.change(lambda: SupportMessage.objects.get(pk=first.pk).delete())
+        self.change(lambda: SupportMessage.objects.get(pk=second.pk).delete())
+        self.assertEqual(cache.get(UNRESOLVED_COUNT_KEY), 1)
+
+    def test_rolled_back_changes_are_not_counted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    SupportMessage.objects.create(sender=self.user, subject='Help', content='?')
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+        self.assertCountMatches()
+
+
+class SupportSyncTests(TestCase):
+    """Support pages start from a cursor and patch in changed messages rendered by the server"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='pass')
+        cls.admin = User.objects.create_superuser('admin', password='pass')
+        cls.first = SupportMessage.objects.create(sender=cls.user, subject='Old', content='Earlier question')
+        cls.second = SupportMessage.objects.create(sender=cls.user, message_type='bug_report', subject='Bug', content='Crash')
+
+    def test_pages_start_from_the_latest_change(self):
+        self.client.force_login(self.user)
+        self.assertContains(self.client.get(reverse('support')), f'data-cursor="{self.second.cursor}"')
+        self.client.force_login(self.admin)
+        self.assertContains(self.client.get(reverse('admin_messages')), f'data-cursor="{self.second.cursor}"')
+
+    def test_user_changes_carry_page_markup(self):
+        self.client.force_login(self.user)
+        self.first.admin_response = 'Fixed it'
+        self.first.save()
+
+        page = self.client.get(reverse('get_user_messages'), {'since': self.second.cursor}).json()
+        [message] = page['messages']
+        self.assertIn(f'data-message-id="{self.first.pk}"', message['html'])
+        self.assertIn('Fixed it', message['html'])
+        self.assertEqual(page['next_cursor'], SupportMessage.objects.get(pk=self.first.pk).cursor)
+
+    def test_admin_changes(self):
+        url = reverse('admin_message_changes')
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.force_login(self.admin)
+        cursor = self.second.cursor
+        page = self.client.get(url, {'since': cursor}).json()
+        self.assertEqual((page['messages'], page['counts'], page['next_cursor']), ([], None, cursor))
+
+        self.second.is_resolved = True
+        self.second.save()
+        page = self.client.get(url, {'since': cursor}).json()
+        [message] = page['messages']
+        self.assertEqual(message['id'], self.second.pk)
+        self.assertIn('data-resolved="true"', message['html'])
+        self.assertEqual(page['counts'], {'all': 2, 'pending': 1, 'resolved': 1, 'time_correction': 0, 'bug_report': 0, 'feedback': 0})
+        self.assertEqual(self.client.get(url, {'since': 'nonsense'}).status_code, 400)
+
+
+class CachedAuthTests(TestCase):
+    """Authenticated requests reach the view without session or user queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='pass')
+        cls.admin = User.objects.create_superuser('admin', password='pass')
+
+    def setUp(self):
+        cache.clear()
+
+    def assertNoAuthQueries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        auth_sql = [q['sql'] for q in queries.captured_queries if 'django_session' in q['sql'] or '"auth_user"' in q['sql']]
+        self.assertEqual(auth_sql, [])
+
+    def test_warm_request_skips_session_and_user_lookup(self):
+        self.client.login(username='student', password='pass')
+        self.client.get(reverse('get_today_study_time'))
+        self.assertNoAuthQueries(reverse('get_today_study_time'))
+
+    def test_admin_changes_invalidate_cached_user(self):
+        user_client = self.client_class()
+        user_client.login(username='student', password='pass')
+        url = reverse('get_today_study_time')
+        self.assertEqual(user_client.get(url).status_code, 200)
+
+        self.client.force_login(self.admin)
+        self.client.post(reverse('admin_toggle_user_status'), {'user_id': self.user.pk}, content_type='application/json')
+        self.assertEqual(user_client.get(url).status_code, 302)
+
+        self.client.post(reverse('admin_toggle_user_status'), {'user_id': self.user.pk}, content_type='application/json')
+        self.assertEqual(user_client.get(url).status_code, 200)
+
+        # A new password invalidates existing sessions through the session auth hash
+        self.client.post(
+            reverse('admin_change_password'), {'user_id': self.user.pk, 'new_password': 'changed-pass'},
+            content_type='application/json',
+        )
+        self.assertEqual(user_client.get(url).status_code, 302)
+
+
+class AssignmentCardTests(TestCase):
+    """A new assignment's card carries the same values the board computes for it"""
+
+    def test_added_card_matches_board_card(self):
+        user = User.objects.create_user('student', password='pass')
+        self.client.force_login(user)
+        deadline = (timezone.now() + timedelta(days=2, hours=5)).strftime('%Y-%m-%dT%H:%M')
+        response = self.client.post(
+            reverse('add_assignment'),
+            {'title': 'Essay', 'subject': 'History', 'deadline': deadline, 'estimated_hours': 3},
+            content_type='application/json',
+        )
+        added = response.json()['assignment']
+        board = self.client.get(reverse('assignment_board')).json()['assignments']
+        self.assertEqual(added, board[0])
+        self.assertIn(added['days_remaining'], (2, 3))
+        self.assertGreater(added['hours_remaining'], 48)
+
+
+class DashboardFragmentTests(TestCase):
+    """Dashboard widgets come from fragment caches until their data version changes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='pass')
+        cls.other = User.objects.create_user('classmate', password='pass')
+        session = StudySession.objects.create(user=cls.user, subject='Math', duration=25, date=timezone.now().date())
+        DailyStudyTotal.apply_delta(cls.user, session.date, minutes=session.duration, sessions=1)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_leaderboard_fragment_is_shared_between_users(self):
+        self.client.force_login(self.user)
+        self.assertContains(self.client.get(reverse('dashboard')), 'student')
+
+        self.client.force_login(self.other)
+        with mock.patch('core.views._get_leaderboards') as get_leaderboards:
+            response = self.client.get(reverse('dashboard'))
+        get_leaderboards.assert_not_called()
+        self.assertContains(response, '<div class="user-info">student', count=2)
+
+    def test_writes_refresh_per_user_fragments(self):
+        self.client.force_login(self.user)
+        self.assertNotContains(self.client.get(reverse('dashboard')), 'Physics')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('create_subject_folder'), {'name': 'Physics'}, content_type='application/json')
+        self.assertContains(self.client.get(reverse('dashboard')), '<span>Physics</span>')
+
+
+class ConcurrentReadTests(TransactionTestCase):
+    """Outside a transaction the dashboard's independent reads run on read-only pool connections"""
+
+    databases = {'default', 'readonly'}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('student', password='pass')
+        SubjectFolder.objects.create(user=self.user, name='Math')
+        Assignment.objects.create(user=self.user, title='Essay', deadline=timezone.now() + timedelta(days=1))
+        for subject, duration in [('Math', 25), ('Physics', 50), ('Math', 15)]:
+            session = StudySession.objects.create(user=self.user, subject=subject, duration=duration, date=timezone.now().date())
+            DailyStudyTotal.apply_delta(self.user, session.date, minutes=session.duration, sessions=1)
+
+    def test_dashboard_views_read_concurrently(self):
+        aliases = []
+        def record(sender, connection, **kwargs):
+            aliases.append(connection.alias)
+        connection_created.connect(record)
+        self.addCleanup(connection_created.disconnect, record)
+
+        self.client.force_login(self.user)
+        stats = self.client.get(reverse('get_dashboard_stats')).json()
+        self.assertEqual(stats['today_total_minutes'], 90)
+        self.assertEqual(stats['subject_labels'], ['Physics', 'Math'])
+        self.assertEqual(stats['subject_data'], [50, 40])
+        self.assertEqual(stats['pending_count'], 1)
+        self.assertEqual(stats['top_streaks'][0]['username'], 'student')
+
+        response = self.client.get(reverse('dashboard'))
+        self.assertContains(response, '<span>Math</span>')
+        self.assertContains(response, 'Essay')
+        self.assertIn('readonly', aliases)
+
+    def test_pool_queries_count_towards_the_request(self):
+        self.client.force_login(self.user)
+
+        def stats_queries():
+            cache.clear()
+            recorder.drain()
+            self.client.get(reverse('get_dashboard_stats'))
+            [sample] = [s for s in recorder.drain() if s[0] == 'get_dashboard_stats']
+            return sample[4]
+
+        pooled = stats_queries()
+        with mock.patch('core.reads._executor', None):
+            self.assertEqual(pooled, stats_queries())
+
+
+class PlatformSnapshotTests(TestCase):
+    """The admin dashboard shows the latest snapshot plus rows created since"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', password='pass')
+        cls.user = User.objects.create_user('student', password='pass')
+        cls.add_activity(cls.user)
+
+    @staticmethod
+    def add_activity(user):
+        session = StudySession.objects.create(user=user, subject='Math', duration=30, date=timezone.now().date())
+        DailyStudyTotal.apply_delta(user, session.date, minutes=session.duration, sessions=1)
+        Assignment.objects.create(user=user, title='Essay', status='completed')
+        QuickNote.objects.create(user=user, subject='Math', title='Limits')
+
+    def test_snapshot_counts_days(self):
+        call_command('snapshot_platform_stats', days=3, stdout=StringIO())
+        self.assertEqual(PlatformDailySnapshot.objects.count(), 3)
+        today = PlatformDailySnapshot.objects.first()
+        self.assertEqual((today.total_users, today.new_users), (2, 2))
+        self.assertEqual((today.total_sessions, today.total_minutes, today.day_minutes), (1, 30, 30))
+        self.assertEqual((today.completed_assignments, today.total_notes), (1, 1))
+        self.assertEqual(PlatformDailySnapshot.objects.last().total_sessions, 0)
+
+    def test_dashboard_adds_rows_created_since_the_snapshot(self):
+        call_command('snapshot_platform_stats', stdout=StringIO())
+        self.add_activity(User.objects.create_user('newcomer', password='pass'))
+
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin_dashboard'))
+        self.assertEqual(response.context['total_users'], 3)
+        self.assertEqual(response.context['total_sessions'], 2)
+        self.assertEqual(response.context['total_study_hours'], 1.0)
+        self.assertEqual(response.context['completed_assignments'], 2)
+        self.assertEqual(response.context['total_notes'], 2)
+        self.assertEqual(json.loads(response.context['trend_json'])['study_hours'], [0.5])
+
+        # Sessions and notes are only read past the snapshot's last ids
+        totals = [
+            query['sql'] for query in queries.captured_queries
+            if re.match(r'SELECT (COUNT|SUM)\(.* FROM "core_(studysession|quicknote)"', query['sql'])
+        ]
+        self.assertEqual(len(totals), 2)
+        for sql in totals:
+            self.assertIn('"id" >', sql)
+
+    def test_assignment_statuses_are_counted_live(self):
+        call_command('snapshot_platform_stats', stdout=StringIO())
+        Assignment.objects.filter(user=self.user).update(status='todo')
+        Assignment.objects.create(user=self.user, title='Lab', status='completed')
+        Assignment.objects.create(user=self.user, title='Quiz', status='in_progress').delete()
+
+        totals = PlatformDailySnapshot.current_totals(PlatformDailySnapshot.objects.first())
+        self.assertEqual(
+            (totals['todo_assignments'], totals['in_progress_assignments'], totals['completed_assignments']), (1, 0, 1),
+        )
+        self.assertEqual(totals['total_assignments'], 2)
+
+    def test_report_recounts_the_snapshot(self):
+        call_command('snapshot_platform_stats', stdout=StringIO())
+        StudySession.objects.all().delete()
+
+        build_activity_report()
+        today = PlatformDailySnapshot.objects.first()
+        self.assertEqual((today.total_sessions, today.total_minutes), (0, 0))
+
+
+class RequestMetricsTests(TestCase):
+    """MetricsMiddleware samples reach RequestMetric and the admin metrics page"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student', password='pass')
+        cls.admin = User.objects.create_superuser('admin', password='pass')
+
+    def setUp(self):
+        recorder.drain()
+
+    def test_requests_are_recorded_per_url_name(self):
+        self.client.force_login(self.user)
+        for _ in range(3):
+            self.client.get(reverse('get_today_study_time'))
+        self.client.get('/no-such-page/')
+        recorder.flush()
+
+        metric = RequestMetric.objects.get(url_name='get_today_study_time')
+        self.assertEqual(metric.request_count, 3)
+        self.assertEqual(sum(metric.histogram), 3)
+        self.assertGreater(metric.query_count, 0)
+        self.assertTrue(RequestMetric.objects.filter(url_name='<unresolved>').exists())
+
+    def test_admin_page_includes_unflushed_samples(self):
+        self.client.force_login(self.admin)
+        self.client.get(reverse('admin_users'))
+        response = self.client.get(reverse('admin_metrics'), {'hours': 1})
+        self.assertContains(response, 'admin_users')
+
+    @override_settings(METRICS_FLUSH_SECONDS=0)
+    def test_samples_are_flushed_after_the_response(self):
+        MetricsMiddleware(lambda request: HttpResponse())(RequestFactory().get('/'))
+        self.assertFalse(RequestMetric.objects.exists())
+
+        # As the test client does, keep the test's transaction open through request_finished
+        request_finished.disconnect(close_old_connections)
+        self.addCleanup(request_finished.connect, close_old_connections)
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(RequestMetric.objects.get().url_name, '<unresolved>')
+
+    async def test_async_requests_are_recorded(self):
+        await self.async_client.aforce_login(self.user)
+        await self.async_client.get(reverse('get_dashboard_stats'))
+        [sample] = [s for s in recorder.drain() if s[0] == 'get_dashboard_stats']
+        self.assertEqual(sample[3], 200)
+        self.assertGreater(sample[4], 0)
+
+    def test_streaming_responses_are_skipped(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('admin_export_sessions'))
+        b''.join(response.streaming_content)
+        self.assertNotIn('admin_export_sessions', [s[0] for s in recorder.drain()])
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse('admin_metrics')).status_code, 302)
+
+
+# ========================================
+# ENDPOINT BENCHMARKS
+# ========================================
+
+BASELINE_FILE = Path(__file__).with_name('benchmark_baselines.json')
+# 20 runs put p95 at the second slowest, so one stray pause doesn't decide it
+BENCHMARK_RUNS = int(os.environ.get('FOCUS_BENCHMARK_RUNS', 20))
+# FOCUS_BENCHMARK_UPDATE=1 rewrites the baselines instead of checking them
+UPDATE_BASELINES = os.environ.get('FOCUS_BENCHMARK_UPDATE') == '1'
+# Latency is noisy and machine dependent, so it is only checked with FOCUS_BENCHMARK=1
+# (on the machine the baselines were recorded on) and gets a factor plus a fixed slack;
+# query counts must not grow at all
+CHECK_LATENCY = os.environ.get('FOCUS_BENCHMARK') == '1'
+LATENCY_FACTOR = float(os.environ.get('FOCUS_BENCHMARK_LATENCY_FACTOR', 2.0))
+LATENCY_SLACK_MS = 10
+ROWS_FACTOR = 1.5
+ROWS_SLACK = 20
+
+# url name -> (who sends it, method, per-run builder returning (url kwargs, data)).
+# Builders run outside the timed section; endpoints that consume an object get a fresh one
+ENDPOINTS = {
+    'login': ('anon', 'get', None),
+    'signup': ('anon', 'get', None),
+    'logout': ('user', 'get', None),
+
+    'dashboard': ('user', 'get', None),
+    'study': ('user', 'get', None),
+    'assignments': ('user', 'get', None),
+    'notes': ('user', 'get', None),
+    'support': ('user', 'get', None),
+
+    'save_study_session': ('user', 'post', lambda t: ({}, {'subject': 'Physics', 'duration': 25})),
+    'save_study_sessions_batch': ('user', 'post', lambda t: ({}, {'sessions': [
+        {'client_id': uuid.uuid4().hex, 'subject': 'Physics', 'duration': 30} for _ in range(5)
+    ]})),
+    'get_today_study_time': ('user', 'get', None),
+    'get_dashboard_stats': ('user', 'get', None),
+    'add_assignment': ('user', 'post', lambda t: ({}, {
+        'title': 'Benchmark', 'subject': 'Physics',
+        'deadline': (timezone.now() + timedelta(days=5)).strftime('%Y-%m-%dT%H:%M'),
+    })),
+    'complete_assignment': ('user', 'post', lambda t: ({'assignment_id': t.new_assignment().pk}, {})),
+    'update_assignment_status': ('user', 'post', lambda t: ({'assignment_id': t.assignment.pk}, {'status': 'in_progress'})),
+    'update_assignment': ('user', 'post', lambda t: ({'assignment_id': t.assignment.pk}, {'title': 'Renamed'})),
+    'delete_assignment': ('user', 'post', lambda t: ({'assignment_id': t.new_assignment().pk}, {})),
+    'assignment_board': ('user', 'get', None),
+    'get_all_completed_assignments': ('user', 'get', None),
+    'save_quick_note': ('user', 'post', lambda t: ({}, {'subject': 'Physics', 'content': 'Benchmark note', 'duration': 25})),
+    'create_subject_folder': ('user', 'post', lambda t: ({}, {'name': f'Folder {uuid.uuid4().hex[:8]}'})),
+    'delete_subject_folder': ('user', 'post', lambda t: ({}, {'folder_id': t.new_folder().pk})),
+    'delete_folder': ('user', 'post', lambda t: ({}, {'folder_id': t.new_folder().pk})),
+    'create_note': ('user', 'post', lambda t: ({}, {'folder_id': t.folder.pk, 'title': 'Benchmark', 'content': 'derivative review'})),
+    'update_note': ('user', 'post', lambda t: ({}, {'note_id': t.note.pk, 'title': 'Edited', 'content': 'integral review'})),
+    'delete_note': ('user', 'post', lambda t: ({}, {'note_id': t.new_note().pk})),
+    'toggle_pin_note': ('user', 'post', lambda t: ({}, {'note_id': t.note.pk})),
+    'list_notes': ('user', 'get', lambda t: ({}, {'cursor': t.note_cursor})),
+    'search_notes': ('user', 'get', lambda t: ({}, {'q': 'derivative'})),
+
+    'send_support_message': ('user', 'post', lambda t: ({}, {'subject': 'Help', 'content': 'Benchmark question'})),
+    'get_user_messages': ('user', 'get', None),
+    'support_events': ('user', 'get', None),
+
+    'admin_dashboard': ('admin', 'get', None),
+    'admin_users': ('admin', 'get', None),
+    'admin_user_detail': ('admin', 'get', lambda t: ({'user_id': t.user.pk}, None)),
+    'admin_passwords': ('admin', 'get', None),
+    'admin_download_report': ('admin', 'get', lambda t: ({'job_id': t.report.pk}, None)),
+    'admin_messages': ('admin', 'get', None),
+    'admin_message_changes': ('admin', 'get', None),
+    'admin_study_sessions': ('admin', 'get', None),
+    'admin_export_sessions': ('admin', 'get', lambda t: ({}, {'format': 'csv'})),
+    'admin_metrics': ('admin', 'get', None),
+
+    'admin_toggle_user_status': ('admin', 'post', lambda t: ({}, {'user_id': t.new_user().pk})),
+    'admin_delete_user': ('admin', 'post', lambda t: ({}, {'user_id': t.new_user().pk})),
+    'admin_change_password': ('admin', 'post', lambda t: ({}, {'user_id': t.new_user().pk, 'new_password': 'Benchmark-pass-1'})),
+    'admin_respond_message': ('admin', 'post', lambda t: ({}, {'message_id': t.new_message().pk, 'response': 'Done'})),
+    'admin_approve_feedback': ('admin', 'post', lambda t: ({}, {'message_id': t.new_message('feedback').pk})),
+    'admin_edit_session': ('admin', 'post', lambda t: ({}, {'session_id': t.new_session().pk, 'duration': 40, 'subject': 'Physics'})),
+    'admin_delete_session': ('admin', 'post', lambda t: ({}, {'session_id': t.new_session().pk})),
+    'admin_generate_report': ('admin', 'post', lambda t: ({}, {})),
+    'admin_report_status': ('admin', 'get', lambda t: ({'job_id': t.report.pk}, None)),
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def count_rows(queries):
+    """Rows returned by the captured SELECTs, found by running them again"""
+    rows = 0
+    with connection.cursor() as cursor:
+        for query in queries:
+            if query['sql'].startswith('SELECT'):
+                cursor.execute(query['sql'])
+                rows += len(cursor.fetchall())
+    return rows
+
+
+@tag('benchmark')
+@override_settings(
+    # Password hashing would dominate the admin password/user endpoints
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    REPORT_WORKER_AUTOSTART=False,
+    # A metrics flush would land in whichever request happened to trigger it
+    METRICS_ENABLED=False,
+)
+class EndpointBenchmarkTests(TestCase):
+    """
+    Drives every URL in core/urls.py against a generated dataset and compares
+    query count and rows fetched with benchmark_baselines.json, plus p50/p95
+    latency when FOCUS_BENCHMARK=1. Record new baselines on the machine that runs the checks with
+    FOCUS_BENCHMARK_UPDATE=1 python manage.py test core.tests.EndpointBenchmarkTests
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # setUpTestData saves a report file, so the override must be in place first
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_override = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('bench_admin', password='pass')
+        call_command(
+            'generate_load_data', users=40, sessions=150, seed=7,
+            prefix='bench_user_', stdout=StringIO(),
+        )
+        # The busiest generated user is the worst case for per-user pages
+        cls.user = (
+            User.objects.filter(username__startswith='bench_user_')
+            .annotate(session_total=Count('study_sessions')).order_by('-session_total', 'pk').first()
+        )
+        cls.folder = SubjectFolder.objects.create(user=cls.user, name='Benchmark')
+        cls.note = QuickNote.objects.create(
+            user=cls.user, subject_folder=cls.folder, subject='Benchmark', title='Benchmark', content='derivative',
+        )
+        cls.assignment = Assignment.objects.create(user=cls.user, title='Benchmark', deadline=timezone.now() + timedelta(days=2))
+        cls.note_cursor = QuickNote.objects.filter(user=cls.user).order_by('-updated_at', '-id')[10].cursor
+        cls.report = ReportJob.objects.create(requested_by=cls.admin, status='done', progress=100)
+        cls.report.file.save('benchmark.pdf', ContentFile(b'%PDF-1.4 benchmark'))
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.media_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
+    def setUp(self):
+        # Samples left by earlier tests would be flushed by the admin_metrics page
+        recorder.drain()
+
+    def new_assignment(self):
+        return Assignment.objects.create(user=self.user, title='Benchmark', deadline=timezone.now() + timedelta(days=4))
+
+    def new_folder(self):
+        return SubjectFolder.objects.create(user=self.user, name=f'Folder {uuid.uuid4().hex[:8]}')
+
+    def new_note(self):
+        return QuickNote.objects.create(user=self.user, subject_folder=self.folder, subject='Benchmark', content='temporary')
+
+    def new_session(self):
+        session = StudySession(subject='Physics', duration=30, date=timezone.now().date())
+        return StudySession.record_batch(self.user, [session])[0]
+
+    def new_user(self):
+        return User.objects.create_user(f'bench_temp_{uuid.uuid4().hex[:8]}', password='pass')
+
+    def new_message(self, message_type='general'):
+        return SupportMessage.objects.create(
+            sender=self.user, recipient=self.admin, message_type=message_type, subject='Help', content='Question',
+        )
+
+    def measure(self, name):
+        role, method, build = ENDPOINTS[name]
+        cache.clear()
+        timings, query_counts = [], []
+        rows = None
+        # Collector pauses land on arbitrary requests; keep them out of the timings
+        gc.collect()
+        gc.disable()
+        self.addCleanup(gc.enable)
+        for _ in range(BENCHMARK_RUNS):
+            # Log in only when needed: a login saves last_login, which evicts the cached user
+            user = {'user': self.user, 'admin': self.admin}.get(role)
+            if user is None:
+                self.client.logout()
+            elif self.client.session.get(SESSION_KEY) != str(user.pk):
+                self.client.force_login(user)
+            kwargs, data = build(self) if build else ({}, None)
+            url = reverse(name, kwargs=kwargs)
+
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                if method == 'post':
+                    response = self.client.post(url, data, content_type='application/json')
+                else:
+                    response = self.client.get(url, data)
+                body = b''.join(response.streaming_content) if response.streaming else response.content
+                elapsed = time.perf_counter() - started
+            response.close()
+            self.assertLess(response.status_code, 400, f'{name}: {body[:200]!r}')
+
+            timings.append(elapsed * 1000)
+            query_counts.append(len(queries.captured_queries))
+            if rows is None:
+                # The first run has a cold cache, so it fetches the most
+                rows = count_rows(queries.captured_queries)
+        gc.enable()
+
+        return {
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'queries': max(query_counts),
+            'rows': rows,
+        }
+
+    def test_every_url_is_benchmarked(self):
+        names = {pattern.name for pattern in urls.urlpatterns if isinstance(pattern, URLPattern)}
+        self.assertEqual(names, set(ENDPOINTS))
+
+    def test_endpoints_within_baselines(self):
+        results = {name: self.measure(name) for name in ENDPOINTS}
+
+        if UPDATE_BASELINES:
+            BASELINE_FILE.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+            return
+
+        baselines = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+        regressions = []
+        for name, result in results.items():
+            baseline = baselines.get(name)
+            if baseline is None:
+                regressions.append(f'{name}: no baseline recorded')
+                continue
+            if result['queries'] > baseline['queries']:
+                regressions.append(f"{name}: {result['queries']} queries (baseline {baseline['queries']})")
+            if result['rows'] > baseline['rows'] * ROWS_FACTOR + ROWS_SLACK:
+                regressions.append(f"{name}: {result['rows']} rows fetched (baseline {baseline['rows']})")
+            if CHECK_LATENCY and result['p95_ms'] > baseline['p95_ms'] * LATENCY_FACTOR + LATENCY_SLACK_MS:
+                regressions.append(f"{name}: p95 {result['p95_ms']}ms (baseline {baseline['p95_ms']}ms)")
+        self.assertFalse(regressions, 'Endpoint regressions:\n' + '\n'.join(regressions))
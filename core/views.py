@@ -1,19 +1,41 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from .forms import CustomUserCreationForm, CustomAuthenticationForm
+from django.conf import settings
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
-from django.views.decorators.http import require_POST
+from django.http import JsonResponse, HttpResponse, FileResponse, Http404, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.urls import reverse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET, require_POST
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from django.utils.text import Truncator
+from asgiref.sync import sync_to_async
 from datetime import datetime, timedelta
+import asyncio
+import csv
 import json
+import os
 import random
 
-from .models import StudySession, Assignment, QuickNote, SubjectFolder, SupportMessage
-from django.db import models
+from .models import StudySession, Assignment, QuickNote, SubjectFolder, SupportMessage, DailyStudyTotal, MonthlyStudyTotal, UserStreak
+from .models import PlatformDailySnapshot, ReportJob, RequestMetric, annotate_assignment_urgency, annotate_user_stats
+from django.db import IntegrityError, models, transaction
+from django.core.paginator import Paginator
+from .reports import enqueue_report
+from .events import ADMIN_CHANNEL, hub, user_channel
+from .metrics import recorder, summarize
+from .caching import (
+    LEADERBOARD_SCOPE, acached_payload, aget_data_version, aget_version, bump_data_version, bump_version, cached_payload,
+    get_version,
+)
+from .reads import gather_reads
 
 
 # Superuser check decorator
@@ -118,13 +140,66 @@ def logout_view(request):
 
 
 # Dashboard View
-@login_required
-def dashboard_view(request):
-    """Main dashboard view"""
-    user = request.user
+def _get_leaderboards():
+    """Leaderboard lists shared by all dashboards, cached per leaderboard version and day"""
+    def build():
+        # Precomputed tables: full list for the modal, top 5 for the card
+        all_study_time_list = MonthlyStudyTotal.get_leaderboard()
+        user_streaks_list = UserStreak.get_leaderboard()
+        all_streaks = [{'username': u['username'], 'value': u['streak']} for u in user_streaks_list]
+        return {
+            'top_study_time': all_study_time_list[:5],
+            'all_study_time': all_study_time_list,
+            'top_streaks': user_streaks_list[:5],
+            'all_streaks': all_streaks,
+            # Pre-serialized for the dashboard's "See All" modal
+            'all_study_time_json': json.dumps(all_study_time_list),
+            'all_streaks_json': json.dumps(all_streaks),
+        }
     
-    # Get today's study time (in minutes)
-    today_total_minutes = StudySession.get_today_total(user)
+    today = timezone.now().date()
+    return cached_payload('leaderboards', [get_version(LEADERBOARD_SCOPE), today], build)
+
+
+async def _build_dashboard_context(user):
+    """Compute the per-user part of the dashboard context (everything except greeting/quote/leaderboards)"""
+    # The reads are independent of each other, so they run concurrently
+    (
+        today_total_minutes, user_streak, weekly_data, month_totals, assignments,
+        no_deadline_assignments, subject_sessions, calendar_rows, subjects, pending_assignments_count,
+    ) = await gather_reads(
+        # Today's study time (in minutes)
+        lambda: StudySession.get_today_total(user),
+        # Study streak
+        lambda: UserStreak.for_user(user),
+        # Weekly data for chart
+        lambda: StudySession.get_weekly_data(user),
+        # Monthly data for chart - calendar months (last 6 months)
+        lambda: StudySession.get_month_totals(user, months=6),
+        # Pending assignments with deadlines (up to 6 for preview), most urgent first
+        # Filter out assignments without deadlines since they can't be scheduled
+        lambda: list(annotate_assignment_urgency(Assignment.objects.filter(
+            user=user,
+            deadline__isnull=False
+        ).exclude(status='completed')).order_by('-urgency_rank', 'deadline')[:6]),
+        # Assignments without deadlines (backlog)
+        lambda: list(Assignment.objects.filter(
+            user=user,
+            deadline__isnull=True
+        ).exclude(status='completed').order_by('-created_at')[:10]),
+        # Minutes per subject for the subject breakdown pie chart
+        lambda: list(StudySession.objects.filter(user=user).values('subject').annotate(
+            minutes=models.Sum('duration')
+        ).order_by().values_list('subject', 'minutes')),
+        # Calendar assignments (only those with deadlines)
+        lambda: list(Assignment.objects.filter(
+            user=user, deadline__isnull=False
+        ).exclude(status='completed').values('title', 'deadline', 'subject')),
+        # Subjects list
+        lambda: list(SubjectFolder.objects.filter(user=user)),
+        # Total pending count (all non-completed assignments, including those without deadlines)
+        lambda: Assignment.objects.filter(user=user).exclude(status='completed').count(),
+    )
     
     # Format today's total - show hours if >= 60 minutes, otherwise show minutes
     if today_total_minutes >= 60:
@@ -137,12 +212,8 @@ def dashboard_view(request):
     else:
         today_total = f"{today_total_minutes}m"
     
-    # Get study streak
-    streak = StudySession.get_study_streak(user)
-    highest_streak = StudySession.get_highest_streak(user)
-    
-    # Get weekly data for chart
-    weekly_data = StudySession.get_weekly_data(user)
+    streak = user_streak.current()
+    highest_streak = user_streak.highest_streak
     
     # Prepare weekly chart data
     chart_labels = []
@@ -151,63 +222,14 @@ def dashboard_view(request):
         chart_labels.append(date.strftime('%a'))  # Mon, Tue, etc.
         chart_data.append(minutes)
     
-    # Get monthly data for chart - aggregated by month (last 6 months)
-    now = timezone.now()
-    chart_labels_monthly = []
-    chart_data_monthly = []
-    
-    # Get last 6 months of data aggregated by month
-    for i in range(5, -1, -1):  # 5, 4, 3, 2, 1, 0 (oldest to newest)
-        # Calculate the target month
-        target_date = now - timedelta(days=i * 30)  # Approximate
-        target_month = target_date.month
-        target_year = target_date.year
-        
-        # Get total minutes for that month
-        month_sessions = StudySession.objects.filter(
-            user=user,
-            date__year=target_year,
-            date__month=target_month
-        )
-        total_minutes = sum(s.duration for s in month_sessions)
-        
-        chart_labels_monthly.append(target_date.strftime('%b'))  # Only month name (Jan, Feb, etc.)
-        chart_data_monthly.append(total_minutes)
-    
-    # Get pending assignments with deadlines (up to 6 for preview)
-    # Filter out assignments without deadlines since they can't be scheduled
-    assignments = Assignment.objects.filter(
-        user=user, 
-        deadline__isnull=False
-    ).exclude(status='completed').order_by('deadline')[:6]
-    
-    # Get assignments without deadlines (backlog)
-    no_deadline_assignments = Assignment.objects.filter(
-        user=user,
-        deadline__isnull=True
-    ).exclude(status='completed').order_by('-created_at')[:10]
-    
-    # Enhanced greeting message with precise timing
-    now = timezone.now()
-    hour = now.hour
-    
-    if 5 <= hour < 12:
-        greeting = "Good morning!"
-    elif 12 <= hour < 17:
-        greeting = "Good afternoon!"
-    elif 17 <= hour < 21:
-        greeting = "Good evening!"
-    else:
-        greeting = "Hello there!"  # Late night or very early morning
+    chart_labels_monthly = [month.strftime('%b') for month in month_totals]  # Only month name (Jan, Feb, etc.)
+    chart_data_monthly = list(month_totals.values())
     
     # Calculate subject breakdown for Pie Chart
-    subject_sessions = StudySession.objects.filter(user=user)
     subject_totals = {}
     total_minutes = 0
     
-    for session in subject_sessions:
-        subject = session.subject
-        minutes = session.duration
+    for subject, minutes in subject_sessions:
         subject_totals[subject] = subject_totals.get(subject, 0) + minutes
         total_minutes += minutes
     
@@ -225,82 +247,20 @@ def dashboard_view(request):
     # Sort by percentage descending
     subject_breakdown.sort(key=lambda x: x['percentage'], reverse=True)
     
-    # Get monthly total hours
-    current_month_sessions = StudySession.objects.filter(user=user, date__month=datetime.now().month, date__year=datetime.now().year)
-    monthly_total_minutes = sum(s.duration for s in current_month_sessions)
-    monthly_total_hours = round(monthly_total_minutes / 60, 1)
+    # Get monthly total hours (current month is the last chart bucket)
+    monthly_total_hours = round(chart_data_monthly[-1] / 60, 1)
 
     # Prepare Calendar Assignments Data
-    all_assignments = Assignment.objects.filter(user=user).exclude(status='completed')
     calendar_assignments = []
-    for assign in all_assignments:
-        # Only include assignments with deadlines
-        if assign.deadline:
-            local_deadline = timezone.localtime(assign.deadline)
-            calendar_assignments.append({
-                'title': assign.title,
-                'deadline': local_deadline.strftime('%Y-%m-%dT%H:%M:%S'),
-                'subject': assign.subject
-            })
-
-    # Prepare Subjects List
-    subjects = SubjectFolder.objects.filter(user=user)
-
-    # Leaderboard Logic
-    # 1. Top Monthly Study Time
-    now = timezone.now()
-    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    
-    top_study_users = User.objects.filter(study_sessions__date__gte=month_start) \
-        .annotate(total_duration=models.Sum('study_sessions__duration')) \
-        .order_by('-total_duration')[:5]
-    
-    top_study_time_data = []
-    for u in top_study_users:
-        duration = u.total_duration or 0
-        hours = round(duration / 60, 1)
-        top_study_time_data.append({
-            'username': u.username,
-            'value': f"{hours}h",
-            'rank': 0 # Will assign index + 1 in template or here
+    for assign in calendar_rows:
+        local_deadline = timezone.localtime(assign['deadline'])
+        calendar_assignments.append({
+            'title': assign['title'],
+            'deadline': local_deadline.strftime('%Y-%m-%dT%H:%M:%S'),
+            'subject': assign['subject']
         })
 
-    # Get ALL study time users for modal
-    all_study_users = User.objects.filter(study_sessions__date__gte=month_start) \
-        .annotate(total_duration=models.Sum('study_sessions__duration')) \
-        .order_by('-total_duration')
-    
-    all_study_time_list = []
-    for u in all_study_users:
-        duration = u.total_duration or 0
-        hours = round(duration / 60, 1)
-        all_study_time_list.append({
-            'username': u.username,
-            'value': f"{hours}h"
-        })
-
-    # 2. Top Streaks (calculating for all users - manageable for mini project)
-    # Note: For production, store streak in user model field
-    all_users = User.objects.all()
-    user_streaks_list = []
-    for u in all_users:
-        s = StudySession.get_study_streak(u)
-        if s > 0: # Only show active streaks
-            user_streaks_list.append({'username': u.username, 'streak': s, 'value': s})
-    
-    # Sort and take top 5
-    user_streaks_list.sort(key=lambda x: x['streak'], reverse=True)
-    top_streaks_data = user_streaks_list[:5]
-    
-    # All streaks for modal
-    all_streaks_list = [{'username': u['username'], 'value': u['streak']} for u in user_streaks_list]
-
-    # Get total pending count (all non-completed assignments, including those without deadlines)
-    pending_assignments_count = Assignment.objects.filter(user=user).exclude(status='completed').count()
-
-    context = {
-        'greeting': greeting,
-        'quote': random.choice(MOTIVATIONAL_QUOTES),
+    return {
         'today_total': today_total,
         'monthly_total_hours': monthly_total_hours,
         'streak': streak,
@@ -317,13 +277,49 @@ def dashboard_view(request):
         'subject_breakdown': subject_breakdown,
         'subjects': subjects,
         'calendar_assignments_json': json.dumps(calendar_assignments),
-        'top_study_time': top_study_time_data,
-        'top_streaks': top_streaks_data,
-        'all_streaks_json': json.dumps(all_streaks_list),
-        'all_study_time_json': json.dumps(all_study_time_list),
     }
+
+
+@login_required
+async def dashboard_view(request):
+    """Main dashboard view"""
+    user = await request.auser()
+    
+    # Cached until the user's data version changes (or the day rolls over)
+    today = timezone.now().date()
+    data_version = await aget_data_version(user)
+    context = dict(await acached_payload(
+        'dashboard', [user.pk, data_version, today],
+        lambda: _build_dashboard_context(user),
+    ))
+    
+    # Enhanced greeting message with precise timing
+    now = timezone.now()
+    hour = now.hour
+    
+    if 5 <= hour < 12:
+        greeting = "Good morning!"
+    elif 12 <= hour < 17:
+        greeting = "Good afternoon!"
+    elif 17 <= hour < 21:
+        greeting = "Good evening!"
+    else:
+        greeting = "Hello there!"  # Late night or very early morning
     
-    return render(request, 'core/dashboard.html', context)
+    context.update({
+        'greeting': greeting,
+        'quote': random.choice(MOTIVATIONAL_QUOTES),
+        # Fragment cache keys; the leaderboard fragment is shared by every user
+        'fragment_timeout': settings.DASHBOARD_CACHE_TIMEOUT,
+        'data_version': data_version,
+        'leaderboard_version': await aget_version(LEADERBOARD_SCOPE),
+        'today': today,
+        # Only looked up when the leaderboard fragments miss
+        'leaderboards': SimpleLazyObject(_get_leaderboards),
+    })
+    
+    # Rendering may query (leaderboards, base template), so it runs in sync code
+    return await sync_to_async(render)(request, 'core/dashboard.html', context)
 
 
 # Study Timer View
@@ -340,8 +336,9 @@ def study_view(request):
     all_subjects = sorted(list(set(list(folder_subjects) + list(session_subjects))))
     
     # Get current and highest streak
-    current_streak = StudySession.get_study_streak(request.user)
-    highest_streak = StudySession.get_highest_streak(request.user)
+    user_streak = UserStreak.for_user(request.user)
+    current_streak = user_streak.current()
+    highest_streak = user_streak.highest_streak
     
     # Add greeting message
     now = timezone.now()
@@ -378,18 +375,30 @@ def save_study_session(request):
         if not subject or not duration:
             return JsonResponse({'error': 'Missing required fields'}, status=400)
         
-        # Create study session
-        session = StudySession.objects.create(
-            user=request.user,
-            subject=subject,
-            duration=duration,
-            date=timezone.now().date()
-        )
+        # The rollups must get the same whole minutes the session row stores
+        try:
+            duration = int(duration)
+        except (TypeError, ValueError):
+            return JsonResponse({'error': 'Duration must be a number of minutes'}, status=400)
+        if duration <= 0:
+            return JsonResponse({'error': 'Duration must be positive'}, status=400)
+        
+        # Create study session and update the daily rollup together
+        with transaction.atomic():
+            session = StudySession.objects.create(
+                user=request.user,
+                subject=subject,
+                duration=duration,
+                date=timezone.now().date()
+            )
+            DailyStudyTotal.apply_delta(request.user, session.date, minutes=duration, sessions=1)
+            bump_data_version(request.user, leaderboard=True)
         
         # Get updated today's total and streak
         today_total = StudySession.get_today_total(request.user)
-        current_streak = StudySession.get_study_streak(request.user)
-        highest_streak = StudySession.get_highest_streak(request.user)
+        streak = UserStreak.for_user(request.user)
+        current_streak = streak.current()
+        highest_streak = streak.highest_streak
         
         return JsonResponse({
             'success': True,
@@ -404,6 +413,91 @@ def save_study_session(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+SESSION_BATCH_MAX = 100
+SESSION_BACKFILL_DAYS = 30
+
+
+def _parse_batch_session(item, now):
+    """Build an unsaved StudySession from one batch entry (raises ValueError if invalid)"""
+    client_id = str(item.get('client_id') or '').strip()
+    if not client_id or len(client_id) > 64:
+        raise ValueError('A client_id of up to 64 characters is required')
+    
+    subject = str(item.get('subject') or '').strip()[:100]
+    duration = item.get('duration')
+    if not subject or not isinstance(duration, int) or isinstance(duration, bool) or not 0 < duration <= 24 * 60:
+        raise ValueError('Missing or invalid subject/duration')
+    
+    # Queued sessions keep the day they were studied, not the day they synced
+    ended_at = now
+    if item.get('ended_at'):
+        ended_at = datetime.fromisoformat(str(item['ended_at']).replace('Z', '+00:00'))
+        if timezone.is_naive(ended_at):
+            ended_at = timezone.make_aware(ended_at)
+        if ended_at > now + timedelta(minutes=5) or ended_at < now - timedelta(days=SESSION_BACKFILL_DAYS):
+            raise ValueError('ended_at is out of range')
+    
+    return StudySession(
+        subject=subject,
+        duration=duration,
+        date=timezone.localtime(ended_at).date(),
+        client_id=client_id,
+    )
+
+
+@login_required
+@require_POST
+def save_study_sessions_batch(request):
+    """Save a batch of queued study sessions, ignoring ones already recorded"""
+    try:
+        data = json.loads(request.body)
+        items = data.get('sessions')
+        
+        if not isinstance(items, list) or not items:
+            return JsonResponse({'error': 'sessions must be a non-empty list'}, status=400)
+        if len(items) > SESSION_BATCH_MAX:
+            return JsonResponse({'error': f'At most {SESSION_BATCH_MAX} sessions per batch'}, status=400)
+        
+        # Invalid entries are reported back so the client can drop them from its queue
+        now = timezone.now()
+        sessions = []
+        rejected = []
+        for item in items:
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError('Each session must be an object')
+                sessions.append(_parse_batch_session(item, now))
+            except ValueError as e:
+                client_id = item.get('client_id') if isinstance(item, dict) else None
+                rejected.append({'client_id': client_id, 'error': str(e)})
+        
+        created = []
+        if sessions:
+            try:
+                created = StudySession.record_batch(request.user, sessions)
+            except IntegrityError:
+                # A concurrent upload of the same batch won the race; the retry skips its rows
+                created = StudySession.record_batch(request.user, sessions)
+            if created:
+                bump_data_version(request.user, leaderboard=True)
+        
+        created_ids = {session.client_id for session in created}
+        streak = UserStreak.for_user(request.user)
+        
+        return JsonResponse({
+            'success': True,
+            'accepted': sorted(created_ids),
+            'duplicates': sorted({s.client_id for s in sessions} - created_ids),
+            'rejected': rejected,
+            'today_total_minutes': StudySession.get_today_total(request.user),
+            'current_streak': streak.current(),
+            'highest_streak': streak.highest_streak,
+        })
+    
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
 @login_required
 def get_today_study_time(request):
     """Get user's total study time for today from database"""
@@ -417,136 +511,104 @@ def get_today_study_time(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+async def _build_dashboard_stats(user):
+    """Compute the per-user part of the dashboard stats API payload"""
+    # The reads are independent of each other, so they run concurrently
+    today_total_minutes, streak, weekly_data, month_totals, subject_sessions, pending_count = await gather_reads(
+        # Today's study time (in minutes)
+        lambda: StudySession.get_today_total(user),
+        # Study streak
+        lambda: StudySession.get_study_streak(user),
+        # Weekly data for chart
+        lambda: StudySession.get_weekly_data(user),
+        # Monthly data for chart (calendar months)
+        lambda: StudySession.get_month_totals(user, months=6),
+        # Minutes per subject for the subject breakdown pie chart
+        lambda: list(StudySession.objects.filter(user=user).values('subject').annotate(
+            minutes=models.Sum('duration')
+        ).order_by().values_list('subject', 'minutes')),
+        # Pending assignments count
+        lambda: Assignment.objects.filter(user=user).exclude(status='completed').count(),
+    )
+    
+    # Format today's total
+    if today_total_minutes >= 60:
+        hours = today_total_minutes // 60
+        remaining_mins = today_total_minutes % 60
+        if remaining_mins > 0:
+            today_total = f"{hours}h {remaining_mins}m"
+        else:
+            today_total = f"{hours}h"
+    else:
+        today_total = f"{today_total_minutes}m"
+    
+    # Weekly chart data
+    chart_labels = []
+    chart_data = []
+    for date, minutes in sorted(weekly_data.items()):
+        chart_labels.append(date.strftime('%a'))
+        chart_data.append(minutes)
+    
+    # Monthly chart data
+    chart_labels_monthly = [month.strftime('%b') for month in month_totals]
+    chart_data_monthly = list(month_totals.values())
+    
+    # Get monthly total hours (current month is the last chart bucket)
+    monthly_total_hours = round(chart_data_monthly[-1] / 60, 1)
+    
+    # Calculate subject breakdown for Pie Chart
+    subject_totals = {}
+    total_minutes_all = 0
+    for subject, minutes in subject_sessions:
+        subject_totals[subject] = subject_totals.get(subject, 0) + minutes
+        total_minutes_all += minutes
+    
+    subject_labels = []
+    subject_data = []
+    if total_minutes_all > 0:
+        sorted_subjects = sorted(subject_totals.items(), key=lambda x: x[1], reverse=True)
+        for subject, minutes in sorted_subjects:
+            subject_labels.append(subject)
+            subject_data.append(minutes)
+    
+    return {
+        'today_total': today_total,
+        'today_total_minutes': today_total_minutes,
+        'streak': streak,
+        'monthly_total_hours': monthly_total_hours,
+        'pending_count': pending_count,
+        'chart_labels': chart_labels,
+        'chart_data': chart_data,
+        'chart_labels_monthly': chart_labels_monthly,
+        'chart_data_monthly': chart_data_monthly,
+        'subject_labels': subject_labels,
+        'subject_data': subject_data,
+    }
+
+
 @login_required
-def get_dashboard_stats(request):
+async def get_dashboard_stats(request):
     """Get updated dashboard statistics via AJAX"""
     try:
-        user = request.user
-        
-        # Get today's study time (in minutes)
-        today_total_minutes = StudySession.get_today_total(user)
-        
-        # Format today's total
-        if today_total_minutes >= 60:
-            hours = today_total_minutes // 60
-            remaining_mins = today_total_minutes % 60
-            if remaining_mins > 0:
-                today_total = f"{hours}h {remaining_mins}m"
-            else:
-                today_total = f"{hours}h"
-        else:
-            today_total = f"{today_total_minutes}m"
-        
-        # Get study streak
-        streak = StudySession.get_study_streak(user)
-        
-        # Get weekly data for chart
-        weekly_data = StudySession.get_weekly_data(user)
-        chart_labels = []
-        chart_data = []
-        for date, minutes in sorted(weekly_data.items()):
-            chart_labels.append(date.strftime('%a'))
-            chart_data.append(minutes)
-        
-        # Get monthly data for chart
-        now = timezone.now()
-        chart_labels_monthly = []
-        chart_data_monthly = []
-        for i in range(5, -1, -1):
-            target_date = now - timedelta(days=i * 30)
-            target_month = target_date.month
-            target_year = target_date.year
-            month_sessions = StudySession.objects.filter(
-                user=user,
-                date__year=target_year,
-                date__month=target_month
-            )
-            total_minutes = sum(s.duration for s in month_sessions)
-            chart_labels_monthly.append(target_date.strftime('%b'))
-            chart_data_monthly.append(total_minutes)
-        
-        # Get monthly total hours
-        current_month_sessions = StudySession.objects.filter(
-            user=user, 
-            date__month=datetime.now().month, 
-            date__year=datetime.now().year
+        user = await request.auser()
+        
+        # Cached until the user's data version changes (or the day rolls over)
+        today = timezone.now().date()
+        stats, [leaderboards] = await asyncio.gather(
+            acached_payload(
+                'dashboard-stats', [user.pk, await aget_data_version(user), today],
+                lambda: _build_dashboard_stats(user),
+            ),
+            gather_reads(_get_leaderboards),
         )
-        monthly_total_minutes = sum(s.duration for s in current_month_sessions)
-        monthly_total_hours = round(monthly_total_minutes / 60, 1)
-        
-        # Calculate subject breakdown for Pie Chart
-        subject_sessions = StudySession.objects.filter(user=user)
-        subject_totals = {}
-        total_minutes_all = 0
-        for session in subject_sessions:
-            subject = session.subject
-            minutes = session.duration
-            subject_totals[subject] = subject_totals.get(subject, 0) + minutes
-            total_minutes_all += minutes
-        
-        subject_labels = []
-        subject_data = []
-        if total_minutes_all > 0:
-            sorted_subjects = sorted(subject_totals.items(), key=lambda x: x[1], reverse=True)
-            for subject, minutes in sorted_subjects:
-                subject_labels.append(subject)
-                subject_data.append(minutes)
-        
-        # Get pending assignments count
-        pending_count = Assignment.objects.filter(user=user).exclude(status='completed').count()
-        
-        # Leaderboard data
-        now = timezone.now()
-        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        
-        # Top study time this month
-        top_study_users = User.objects.filter(study_sessions__date__gte=month_start) \
-            .annotate(total_duration=models.Sum('study_sessions__duration')) \
-            .order_by('-total_duration')[:5]
-        top_study_time_list = []
-        for u in top_study_users:
-            duration = u.total_duration or 0
-            hours = round(duration / 60, 1)
-            top_study_time_list.append({'username': u.username, 'value': f"{hours}h"})
-        
-        # Top streaks
-        all_users = User.objects.all()
-        user_streaks = []
-        for u in all_users:
-            s = StudySession.get_study_streak(u)
-            if s > 0:
-                user_streaks.append({'username': u.username, 'streak': s, 'value': s})
-        user_streaks.sort(key=lambda x: x['streak'], reverse=True)
-        top_streaks_list = user_streaks[:5]
-        
-        # All data for modal
-        all_study_users = User.objects.filter(study_sessions__date__gte=month_start) \
-            .annotate(total_duration=models.Sum('study_sessions__duration')) \
-            .order_by('-total_duration')
-        all_study_time_list = []
-        for u in all_study_users:
-            duration = u.total_duration or 0
-            hours = round(duration / 60, 1)
-            all_study_time_list.append({'username': u.username, 'value': f"{hours}h"})
-        all_streaks_list = [{'username': u['username'], 'value': u['streak']} for u in user_streaks]
         
         return JsonResponse({
             'success': True,
-            'today_total': today_total,
-            'today_total_minutes': today_total_minutes,
-            'streak': streak,
-            'monthly_total_hours': monthly_total_hours,
-            'pending_count': pending_count,
-            'chart_labels': chart_labels,
-            'chart_data': chart_data,
-            'chart_labels_monthly': chart_labels_monthly,
-            'chart_data_monthly': chart_data_monthly,
-            'subject_labels': subject_labels,
-            'subject_data': subject_data,
-            'top_streaks': top_streaks_list,
-            'top_study_time': top_study_time_list,
-            'all_streaks': all_streaks_list,
-            'all_study_time': all_study_time_list,
+            **stats,
+            'top_streaks': leaderboards['top_streaks'],
+            'top_study_time': leaderboards['top_study_time'],
+            'all_streaks': leaderboards['all_streaks'],
+            'all_study_time': leaderboards['all_study_time'],
         })
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
@@ -555,39 +617,10 @@ def get_dashboard_stats(request):
 # Assignments View
 @login_required
 def assignments_view(request):
-    """Assignments page with Kanban board view"""
-    # Get pending assignments (todo, in_progress, or legacy 'pending' status)
-    pending_assignments = Assignment.objects.filter(
-        user=request.user
-    ).exclude(status='completed')
-    
+    """Assignments page with Kanban board view (the board loads from assignment_board)"""
+    pending_count = Assignment.objects.filter(user=request.user).exclude(status='completed').count()
     completed_assignments = Assignment.objects.filter(user=request.user, status='completed').order_by('-completed_at')[:5]
     
-    # Prepare assignment data for Kanban board
-    assignments_data = []
-    for assignment in pending_assignments:
-        # Handle deadline properly (could be None)
-        deadline_str = ''
-        if assignment.deadline:
-            local_deadline = timezone.localtime(assignment.deadline)
-            deadline_str = local_deadline.strftime('%Y-%m-%dT%H:%M:%S')
-        
-        # Map legacy 'pending' status to 'todo'
-        status = assignment.status if assignment.status in ['todo', 'in_progress'] else 'todo'
-        assignments_data.append({
-            'id': assignment.id,
-            'title': assignment.title,
-            'description': assignment.description,
-            'subject': assignment.subject,
-            'deadline': deadline_str,
-            'estimated_hours': float(assignment.estimated_hours),
-            'hours_remaining': assignment.hours_remaining(),
-            'days_remaining': assignment.days_remaining(),
-            'urgency': assignment.urgency,
-            'priority': assignment.priority,
-            'status': status,
-        })
-    
     # Add greeting message
     now = timezone.now()
     hour = now.hour
@@ -602,15 +635,66 @@ def assignments_view(request):
         greeting = "Working late?"
     
     context = {
-        'pending_assignments': pending_assignments,
+        'pending_count': pending_count,
         'completed_assignments': completed_assignments,
-        'assignments_json': json.dumps(assignments_data),
         'greeting': greeting,
     }
     
     return render(request, 'core/assignments.html', context)
 
 
+def _assignment_board_etag(request):
+    # Any add/edit/move/complete bumps updated_at and a delete changes the count.
+    # Urgency and days left in the payload only move when the date changes.
+    latest = Assignment.objects.filter(user=request.user).aggregate(
+        changed=models.Max('updated_at'),
+        count=models.Count('id'),
+    )
+    changed = latest['changed'].timestamp() if latest['changed'] else 0
+    return f"{request.user.pk}-{latest['count']}-{changed}-{timezone.now().date().isoformat()}"
+
+
+@login_required
+@require_GET
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_assignment_board_etag)
+def assignment_board(request):
+    """Pending assignments for the Kanban board (revalidated with ETag / 304)"""
+    # Get pending assignments (todo, in_progress, or legacy 'pending' status),
+    # most urgent first with urgency and days left computed by the database
+    pending_assignments = annotate_assignment_urgency(
+        Assignment.objects.filter(user=request.user).exclude(status='completed')
+    ).order_by('-urgency_rank', models.F('deadline').asc(nulls_last=True))
+    
+    assignments_data = [_assignment_card_data(assignment) for assignment in pending_assignments]
+    return JsonResponse({'success': True, 'assignments': assignments_data})
+
+
+def _assignment_card_data(assignment):
+    """Board card fields of an assignment loaded through annotate_assignment_urgency"""
+    # Handle deadline properly (could be None)
+    deadline_str = ''
+    if assignment.deadline:
+        local_deadline = timezone.localtime(assignment.deadline)
+        deadline_str = local_deadline.strftime('%Y-%m-%dT%H:%M:%S')
+    
+    # Map legacy 'pending' status to 'todo'
+    status = assignment.status if assignment.status in ['todo', 'in_progress'] else 'todo'
+    return {
+        'id': assignment.id,
+        'title': assignment.title,
+        'description': assignment.description,
+        'subject': assignment.subject,
+        'deadline': deadline_str,
+        'estimated_hours': float(assignment.estimated_hours),
+        'hours_remaining': max(0, round(assignment.time_left.total_seconds() / 3600, 1)) if assignment.deadline else None,
+        'days_remaining': assignment.days_left.days if assignment.deadline else None,
+        'urgency': assignment.live_urgency,
+        'priority': assignment.priority,
+        'status': status,
+    }
+
+
 @login_required
 @require_POST
 def add_assignment(request):
@@ -646,28 +730,13 @@ def add_assignment(request):
             deadline=deadline_datetime,
             status=data.get('status', 'todo'),  # Use status from form
         )
+        bump_data_version(request.user)
         
-        # Handle deadline format properly (could be None)
-        deadline_str = ''
-        if assignment.deadline:
-            local_deadline = timezone.localtime(assignment.deadline)
-            deadline_str = local_deadline.strftime('%Y-%m-%dT%H:%M:%S')
-        
+        # Reload through the board's query so the new card matches the others
+        assignment = annotate_assignment_urgency(Assignment.objects.filter(pk=assignment.pk)).get()
         return JsonResponse({
             'success': True,
-            'assignment': {
-                'id': assignment.id,
-                'title': assignment.title,
-                'description': assignment.description,
-                'subject': assignment.subject,
-                'deadline': deadline_str,
-                'estimated_hours': float(assignment.estimated_hours),
-                'hours_remaining': assignment.hours_remaining(),
-                'days_remaining': assignment.days_remaining(),
-                'urgency': assignment.urgency,
-                'priority': assignment.priority,
-                'status': assignment.status,
-            }
+            'assignment': _assignment_card_data(assignment),
         })
     
     except Exception as e:
@@ -683,6 +752,7 @@ def complete_assignment(request, assignment_id):
         assignment.status = 'completed'
         assignment.completed_at = timezone.now()
         assignment.save()
+        bump_data_version(request.user)
         
         return JsonResponse({'success': True})
     
@@ -705,6 +775,7 @@ def update_assignment_status(request, assignment_id):
         assignment = get_object_or_404(Assignment, id=assignment_id, user=request.user)
         assignment.status = new_status
         assignment.save()
+        bump_data_version(request.user)
         
         return JsonResponse({'success': True})
     
@@ -746,6 +817,7 @@ def update_assignment(request, assignment_id):
                 assignment.deadline = None
         
         assignment.save()
+        bump_data_version(request.user)
         
         # Return updated assignment data
         assignment_data = {
@@ -771,6 +843,7 @@ def delete_assignment(request, assignment_id):
     try:
         assignment = get_object_or_404(Assignment, id=assignment_id, user=request.user)
         assignment.delete()
+        bump_data_version(request.user)
         
         return JsonResponse({'success': True})
     
@@ -802,6 +875,10 @@ def get_all_completed_assignments(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+NOTES_PAGE_SIZE = 24
+NOTE_SEARCH_PAGE_SIZE = 20
+
+
 # Quick Notes View
 @login_required
 def notes_view(request):
@@ -819,6 +896,8 @@ def notes_view(request):
     selected_folder = None
     notes = None
     pinned_notes = None
+    next_cursor = None
+    notes_count = 0
     
     if folder_id:
         try:
@@ -829,13 +908,10 @@ def notes_view(request):
                 subject_folder=selected_folder,
                 is_pinned=True
             ).order_by('-pinned_at')[:4]
-            # Get all other notes (excluding pinned)
-            notes = QuickNote.objects.filter(
-                user=request.user, 
-                subject_folder=selected_folder,
-                is_pinned=False
-            ).order_by('-updated_at')
-        except SubjectFolder.DoesNotExist:
+            # First page of the other notes (excluding pinned), the rest loads on scroll
+            notes, next_cursor = QuickNote.get_page(request.user, folder=selected_folder, limit=NOTES_PAGE_SIZE)
+            notes_count = next(f.note_count for f in folders if f.id == selected_folder.id)
+        except (SubjectFolder.DoesNotExist, ValueError):
             notes = QuickNote.objects.none()
             pinned_notes = QuickNote.objects.none()
     else:
@@ -844,10 +920,8 @@ def notes_view(request):
             user=request.user,
             is_pinned=True
         ).order_by('-pinned_at')[:4]
-        notes = QuickNote.objects.filter(
-            user=request.user,
-            is_pinned=False
-        ).order_by('-updated_at')
+        notes, next_cursor = QuickNote.get_page(request.user, limit=NOTES_PAGE_SIZE)
+        notes_count = total_notes
     
     # Add greeting message
     now = timezone.now()
@@ -868,12 +942,105 @@ def notes_view(request):
         'notes': notes,
         'pinned_notes': pinned_notes,
         'total_notes': total_notes,
+        'notes_count': notes_count,
+        'next_cursor': next_cursor,
         'greeting': greeting,
     }
     
     return render(request, 'core/notes.html', context)
 
 
+def _note_data(note):
+    return {
+        'id': note.id,
+        'title': note.title,
+        'content': note.content,
+        'preview': Truncator(note.content).words(30),
+        'created': note.created_at.strftime('%b %d, %Y'),
+        'updated': note.updated_at.strftime('%b %d, %Y'),
+        'is_pinned': note.is_pinned,
+    }
+
+
+@login_required
+def list_notes(request):
+    """Next page of unpinned notes for the notes page (keyset cursor)"""
+    try:
+        folder = None
+        folder_id = request.GET.get('folder')
+        if folder_id:
+            try:
+                folder = SubjectFolder.objects.get(id=folder_id, user=request.user)
+            except (SubjectFolder.DoesNotExist, ValueError):
+                return JsonResponse({'error': 'Folder not found'}, status=404)
+        
+        try:
+            notes, next_cursor = QuickNote.get_page(
+                request.user,
+                folder=folder,
+                cursor=request.GET.get('cursor'),
+                limit=NOTES_PAGE_SIZE,
+            )
+        except ValueError:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+        
+        return JsonResponse({
+            'success': True,
+            'notes': [_note_data(note) for note in notes],
+            'next_cursor': next_cursor,
+        })
+    
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+def search_notes(request):
+    """Ranked full-text search over the current user's notes"""
+    try:
+        query = request.GET.get('q', '').strip()
+        if not query:
+            return JsonResponse({'error': 'Search query is required'}, status=400)
+        
+        folder = None
+        folder_id = request.GET.get('folder')
+        if folder_id:
+            try:
+                folder = SubjectFolder.objects.get(id=folder_id, user=request.user)
+            except (SubjectFolder.DoesNotExist, ValueError):
+                return JsonResponse({'error': 'Folder not found'}, status=404)
+        
+        try:
+            page = max(int(request.GET.get('page', 1)), 1)
+        except ValueError:
+            page = 1
+        
+        notes, has_more = QuickNote.search(
+            request.user,
+            query,
+            folder=folder,
+            limit=NOTE_SEARCH_PAGE_SIZE,
+            offset=(page - 1) * NOTE_SEARCH_PAGE_SIZE,
+        )
+        
+        results = []
+        for note in notes:
+            data = _note_data(note)
+            data['snippet'] = note.snippet
+            data['folder'] = note.subject_folder.name if note.subject_folder else None
+            results.append(data)
+        
+        return JsonResponse({
+            'success': True,
+            'results': results,
+            'page': page,
+            'has_more': has_more,
+        })
+    
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
 @login_required
 @require_POST
 def create_subject_folder(request):
@@ -893,6 +1060,7 @@ def create_subject_folder(request):
             user=request.user,
             name=folder_name
         )
+        bump_data_version(request.user)
         
         return JsonResponse({
             'success': True,
@@ -973,6 +1141,7 @@ def delete_folder(request):
         
         folder = SubjectFolder.objects.get(id=folder_id, user=request.user)
         folder.delete()  # This will cascade delete all notes in the folder
+        bump_data_version(request.user)
         
         return JsonResponse({'success': True})
     
@@ -996,6 +1165,7 @@ def delete_subject_folder(request):
         folder = SubjectFolder.objects.get(id=folder_id, user=request.user)
         folder_name = folder.name
         folder.delete()  # This will cascade delete all notes in the folder
+        bump_data_version(request.user)
         
         return JsonResponse({
             'success': True,
@@ -1123,60 +1293,81 @@ def toggle_pin_note(request):
 # ADMIN VIEWS - Superuser Only
 # ========================================
 
+def _user_stats_row(user):
+    """Template row for a user annotated by annotate_user_stats"""
+    return {
+        'user': user,
+        'study_hours': round(user.study_minutes / 60, 1),
+        'study_minutes': user.study_minutes,
+        'assignments': user.assignment_count,
+        'completed_assignments': user.completed_count,
+        'notes': user.note_count,
+        'folders': user.folder_count,
+    }
+
+
+# Sortable columns on the admin users page: key -> (label, order_by field)
+ADMIN_USER_SORTS = {
+    'username': ('User', 'username'),
+    'status': ('Status', 'is_active'),
+    'study': ('Study Time', 'study_minutes'),
+    'assignments': ('Assignments', 'assignment_count'),
+    'completed': ('Completed', 'completed_count'),
+    'notes': ('Notes', 'note_count'),
+    'folders': ('Folders', 'folder_count'),
+    'joined': ('Joined', 'date_joined'),
+}
+ADMIN_USERS_PER_PAGE = 25
+
+# Days of snapshot history in the admin dashboard trend charts
+ADMIN_TREND_DAYS = 30
+
+
 @login_required
 @superuser_required
 def admin_dashboard_view(request):
     """Admin dashboard with overview of all users and system stats"""
     # Get all users (excluding the current admin for user list)
     all_users = User.objects.all().order_by('-date_joined')
-    total_users = all_users.count()
     
     # Get active users (logged in within last 7 days)
     week_ago = timezone.now() - timedelta(days=7)
     active_users = User.objects.filter(last_login__gte=week_ago).count()
     
-    # Get total study sessions and time
-    total_sessions = StudySession.objects.count()
-    total_study_minutes = StudySession.objects.aggregate(total=models.Sum('duration'))['total'] or 0
-    total_study_hours = round(total_study_minutes / 60, 1)
-    
-    # Get total assignments
-    total_assignments = Assignment.objects.count()
-    pending_assignments = Assignment.objects.filter(status='pending').count()
-    completed_assignments = Assignment.objects.filter(status='completed').count()
-    
-    # Get total notes
-    total_notes = QuickNote.objects.count()
+    # Platform totals: the latest snapshot plus rows created since it was taken.
+    # The same query feeds the trend charts.
+    snapshots = list(PlatformDailySnapshot.objects.all()[:ADMIN_TREND_DAYS])
+    totals = PlatformDailySnapshot.current_totals(snapshots[0] if snapshots else None)
+    snapshots.reverse()
+    trend = {
+        'labels': [snapshot.date.strftime('%b %d') for snapshot in snapshots],
+        'study_hours': [round(snapshot.day_minutes / 60, 1) for snapshot in snapshots],
+        'studying_users': [snapshot.studying_users for snapshot in snapshots],
+        'total_users': [snapshot.total_users for snapshot in snapshots],
+        'active_users': [snapshot.active_users for snapshot in snapshots],
+    }
     
     # Get recent users (last 5)
     recent_users = User.objects.order_by('-date_joined')[:5]
     
-    # Calculate user stats for display
-    user_stats = []
-    for user in all_users[:10]:  # Top 10 users
-        user_study_time = StudySession.objects.filter(user=user).aggregate(
-            total=models.Sum('duration')
-        )['total'] or 0
-        user_assignments = Assignment.objects.filter(user=user).count()
-        user_notes = QuickNote.objects.filter(user=user).count()
-        
-        user_stats.append({
-            'user': user,
-            'study_minutes': user_study_time,
-            'study_hours': round(user_study_time / 60, 1),
-            'assignments': user_assignments,
-            'notes': user_notes,
-        })
+    # Calculate user stats for display (top 10 users, one annotated query)
+    user_stats = [_user_stats_row(user) for user in annotate_user_stats(all_users)[:10]]
+    
+    # Last finished report, offered as a direct download
+    latest_report = ReportJob.objects.filter(status='done').exclude(file='').first()
     
     context = {
-        'total_users': total_users,
+        'latest_report': latest_report,
+        'total_users': totals['total_users'],
         'active_users': active_users,
-        'total_sessions': total_sessions,
-        'total_study_hours': total_study_hours,
-        'total_assignments': total_assignments,
-        'pending_assignments': pending_assignments,
-        'completed_assignments': completed_assignments,
-        'total_notes': total_notes,
+        'total_sessions': totals['total_sessions'],
+        'total_study_hours': round(totals['total_minutes'] / 60, 1),
+        'total_assignments': totals['total_assignments'],
+        'pending_assignments': totals['pending_assignments'],
+        'completed_assignments': totals['completed_assignments'],
+        'total_notes': totals['total_notes'],
+        'snapshot_taken_at': snapshots[-1].taken_at if snapshots else None,
+        'trend_json': json.dumps(trend),
         'recent_users': recent_users,
         'user_stats': user_stats,
     }
@@ -1188,32 +1379,41 @@ def admin_dashboard_view(request):
 @superuser_required
 def admin_users_view(request):
     """View and manage all users"""
-    users = User.objects.all().order_by('-date_joined')
+    # Sorting by any column, default newest first
+    sort = request.GET.get('sort', 'joined')
+    if sort not in ADMIN_USER_SORTS:
+        sort = 'joined'
+    order = 'asc' if request.GET.get('order') == 'asc' else 'desc'
+    sort_field = ADMIN_USER_SORTS[sort][1]
+    
+    users = annotate_user_stats(User.objects.all()).order_by(
+        sort_field if order == 'asc' else f'-{sort_field}', 'id'
+    )
     
-    # Calculate stats for each user
-    user_list = []
-    for user in users:
-        study_time = StudySession.objects.filter(user=user).aggregate(
-            total=models.Sum('duration')
-        )['total'] or 0
-        assignments_count = Assignment.objects.filter(user=user).count()
-        completed_assignments = Assignment.objects.filter(user=user, status='completed').count()
-        notes_count = QuickNote.objects.filter(user=user).count()
-        folders_count = SubjectFolder.objects.filter(user=user).count()
-        
-        user_list.append({
-            'user': user,
-            'study_hours': round(study_time / 60, 1),
-            'study_minutes': study_time,
-            'assignments': assignments_count,
-            'completed_assignments': completed_assignments,
-            'notes': notes_count,
-            'folders': folders_count,
+    # Server-side pagination: only the current page is annotated and fetched
+    paginator = Paginator(users, ADMIN_USERS_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    user_list = [_user_stats_row(user) for user in page_obj]
+    
+    # Header links: clicking the active column flips the order
+    columns = []
+    for key, (label, _) in ADMIN_USER_SORTS.items():
+        next_order = 'asc' if key == sort and order == 'desc' else 'desc'
+        columns.append({
+            'key': key,
+            'label': label,
+            'active': key == sort,
+            'order': order,
+            'query': f'sort={key}&order={next_order}',
         })
     
     context = {
         'users': user_list,
-        'total_users': len(user_list),
+        'total_users': paginator.count,
+        'page_obj': page_obj,
+        'columns': columns,
+        'sort': sort,
+        'order': order,
     }
     
     return render(request, 'core/admin_users.html', context)
@@ -1330,6 +1530,7 @@ def admin_delete_user(request):
         
         username = target_user.username
         target_user.delete()
+        bump_version(LEADERBOARD_SCOPE)
         
         return JsonResponse({
             'success': True,
@@ -1344,209 +1545,45 @@ def admin_delete_user(request):
 
 @login_required
 @superuser_required
+@require_POST
 def admin_generate_report(request):
-    """Generate PDF report of all users and their activities"""
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import A4, landscape
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT
-    from io import BytesIO
-    
-    # Create the HttpResponse object with PDF headers
-    buffer = BytesIO()
-    
-    # Create the PDF document
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=landscape(A4),
-        rightMargin=30,
-        leftMargin=30,
-        topMargin=30,
-        bottomMargin=30
-    )
-    
-    # Container for the PDF elements
-    elements = []
-    
-    # Get styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        textColor=colors.HexColor('#6699BB')
-    )
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=12,
-        spaceBefore=20,
-        textColor=colors.HexColor('#333333')
-    )
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=6
-    )
-    
-    # Title
-    elements.append(Paragraph('FOCUS - User Activity Report', title_style))
-    elements.append(Paragraph(f'Generated on: {timezone.now().strftime("%B %d, %Y at %H:%M")}', normal_style))
-    elements.append(Spacer(1, 20))
-    
-    # Platform Statistics
-    elements.append(Paragraph('Platform Overview', heading_style))
-    
-    total_users = User.objects.count()
-    total_sessions = StudySession.objects.count()
-    total_study_minutes = StudySession.objects.aggregate(total=models.Sum('duration'))['total'] or 0
-    total_assignments = Assignment.objects.count()
-    total_notes = QuickNote.objects.count()
-    
-    stats_data = [
-        ['Metric', 'Value'],
-        ['Total Users', str(total_users)],
-        ['Total Study Sessions', str(total_sessions)],
-        ['Total Study Time', f'{round(total_study_minutes / 60, 1)} hours'],
-        ['Total Assignments', str(total_assignments)],
-        ['Total Notes', str(total_notes)],
-    ]
-    
-    stats_table = Table(stats_data, colWidths=[200, 150])
-    stats_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#6699BB')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f5f5f5')),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dddddd')),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('TOPPADDING', (0, 1), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-    ]))
-    elements.append(stats_table)
-    elements.append(Spacer(1, 30))
-    
-    # All Users Summary Table
-    elements.append(Paragraph('All Users Summary', heading_style))
-    
-    users = User.objects.all().order_by('-date_joined')
-    user_data = [['Username', 'Email', 'Status', 'Role', 'Study Time', 'Assignments', 'Notes', 'Joined']]
-    
-    for user in users:
-        study_time = StudySession.objects.filter(user=user).aggregate(
-            total=models.Sum('duration')
-        )['total'] or 0
-        assignments_count = Assignment.objects.filter(user=user).count()
-        notes_count = QuickNote.objects.filter(user=user).count()
-        
-        user_data.append([
-            user.username,
-            user.email or 'N/A',
-            'Active' if user.is_active else 'Disabled',
-            'Admin' if user.is_superuser else 'User',
-            f'{round(study_time / 60, 1)}h',
-            str(assignments_count),
-            str(notes_count),
-            user.date_joined.strftime('%Y-%m-%d')
-        ])
-    
-    user_table = Table(user_data, colWidths=[80, 120, 60, 50, 70, 70, 50, 80])
-    user_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#669977')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f9f9f9')),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dddddd')),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('TOPPADDING', (0, 1), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
-    ]))
-    elements.append(user_table)
-    
-    # Individual User Details
-    elements.append(PageBreak())
-    elements.append(Paragraph('Individual User Details', title_style))
-    
-    for user in users:
-        elements.append(Paragraph(f'User: {user.username}', heading_style))
-        
-        # User info
-        info_text = f"Email: {user.email or 'N/A'} | Status: {'Active' if user.is_active else 'Disabled'} | "
-        info_text += f"Role: {'Administrator' if user.is_superuser else 'Regular User'} | "
-        info_text += f"Joined: {user.date_joined.strftime('%B %d, %Y')}"
-        elements.append(Paragraph(info_text, normal_style))
-        
-        # Study Sessions Summary
-        study_sessions = StudySession.objects.filter(user=user)
-        total_time = study_sessions.aggregate(total=models.Sum('duration'))['total'] or 0
-        
-        # Subject breakdown
-        subject_totals = {}
-        for session in study_sessions:
-            subject_totals[session.subject] = subject_totals.get(session.subject, 0) + session.duration
-        
-        if subject_totals:
-            elements.append(Paragraph('Study Time by Subject:', normal_style))
-            subject_data = [['Subject', 'Time Studied']]
-            for subject, minutes in sorted(subject_totals.items(), key=lambda x: x[1], reverse=True):
-                subject_data.append([subject, f'{round(minutes / 60, 1)} hours ({minutes} min)'])
-            subject_data.append(['TOTAL', f'{round(total_time / 60, 1)} hours'])
-            
-            subject_table = Table(subject_data, colWidths=[200, 150])
-            subject_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#CCBB66')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#dddddd')),
-                ('TOPPADDING', (0, 0), (-1, -1), 5),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-                ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e8e8e8')),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ]))
-            elements.append(subject_table)
-        else:
-            elements.append(Paragraph('No study sessions recorded.', normal_style))
-        
-        # Assignments
-        assignments = Assignment.objects.filter(user=user)
-        pending = assignments.filter(status='pending').count()
-        completed = assignments.filter(status='completed').count()
-        elements.append(Paragraph(f'Assignments: {pending} pending, {completed} completed', normal_style))
-        
-        # Notes
-        notes_count = QuickNote.objects.filter(user=user).count()
-        folders_count = SubjectFolder.objects.filter(user=user).count()
-        elements.append(Paragraph(f'Notes: {notes_count} notes in {folders_count} folders', normal_style))
-        
-        elements.append(Spacer(1, 20))
-    
-    # Build the PDF
-    doc.build(elements)
-    
-    # Get the value of the BytesIO buffer and create response
-    pdf = buffer.getvalue()
-    buffer.close()
-    
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="FOCUS_User_Report_{timezone.now().strftime("%Y%m%d_%H%M")}.pdf"'
-    response.write(pdf)
-    
-    return response
+    """Queue a PDF report of all users (or reuse the last one if no data changed)"""
+    try:
+        job = enqueue_report(request.user)
+        return JsonResponse({'success': True, **_report_job_data(job)})
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+@superuser_required
+def admin_report_status(request, job_id):
+    """Progress of a queued report job"""
+    job = get_object_or_404(ReportJob, id=job_id)
+    return JsonResponse({'success': True, **_report_job_data(job)})
+
+
+@login_required
+@superuser_required
+def admin_download_report(request, job_id):
+    """Download a finished report PDF"""
+    job = get_object_or_404(ReportJob, id=job_id, status='done')
+    if not job.file:
+        raise Http404('Report file has been removed')
+    return FileResponse(job.file.open('rb'), as_attachment=True, filename=os.path.basename(job.file.name))
+
+
+def _report_job_data(job):
+    """JSON fields describing a report job"""
+    return {
+        'job_id': job.id,
+        'status': job.status,
+        'progress': job.progress,
+        'error': job.error,
+        'created_at': timezone.localtime(job.created_at).strftime('%b %d, %Y at %I:%M %p'),
+        'status_url': reverse('admin_report_status', args=[job.id]),
+        'download_url': reverse('admin_download_report', args=[job.id]) if job.status == 'done' and job.file else None,
+    }
 
 
 @login_required
@@ -1617,9 +1654,9 @@ def support_view(request):
     user = request.user
     
     # Get user's messages (sent and received)
-    user_messages = SupportMessage.objects.filter(
+    user_messages = list(SupportMessage.objects.filter(
         models.Q(sender=user) | models.Q(recipient=user)
-    ).order_by('-created_at')
+    ).select_related('study_session').order_by('-created_at'))
     
     # Get user's study sessions for time correction requests
     study_sessions = StudySession.objects.filter(user=user).order_by('-date', '-created_at')[:50]
@@ -1655,6 +1692,8 @@ def support_view(request):
     
     context = {
         'support_messages': user_messages,
+        # The page's live updates fetch changes after this
+        'sync_cursor': SupportMessage.latest_cursor(user_messages),
         'study_sessions': study_sessions,
         'session_subjects': session_subjects,
         'unread_count': unread_count,
@@ -1713,74 +1752,153 @@ def send_support_message(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+USER_MESSAGES_PAGE_SIZE = 50
+
+
 @login_required
 def get_user_messages(request):
-    """Get all messages for the current user"""
+    """
+    Messages for the current user changed after the `since` cursor (all from the
+    start without one). Pass back `next_cursor` to sync incrementally.
+    """
     try:
         user = request.user
-        user_messages = SupportMessage.objects.filter(
-            models.Q(sender=user) | models.Q(recipient=user)
-        ).order_by('-created_at')
+        since = request.GET.get('since')
+        try:
+            user_messages, has_more = SupportMessage.changed_since(user, since, limit=USER_MESSAGES_PAGE_SIZE)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
         
         messages_data = []
         for msg in user_messages:
             messages_data.append({
                 'id': msg.id,
                 'sender': msg.sender.username,
-                'recipient': msg.recipient.username,
+                'recipient': msg.recipient.username if msg.recipient else None,
                 'message_type': msg.message_type,
                 'subject': msg.subject,
                 'content': msg.content,
-                'is_from_user': msg.sender == user,
+                'is_from_user': msg.sender_id == user.id,
                 'admin_response': msg.admin_response,
                 'is_resolved': msg.is_resolved,
                 'created_at': msg.created_at.strftime('%b %d, %Y at %I:%M %p'),
                 'responded_at': msg.responded_at.strftime('%b %d, %Y at %I:%M %p') if msg.responded_at else None,
+                'updated_at': msg.updated_at.strftime('%b %d, %Y at %I:%M %p'),
+                # Same markup as the support page, for patching it in place
+                'html': render_to_string('core/partials/support_message.html', {'msg': msg}),
             })
         
-        return JsonResponse({'success': True, 'messages': messages_data})
+        return JsonResponse({
+            'success': True,
+            'messages': messages_data,
+            'next_cursor': user_messages[-1].cursor if user_messages else since,
+            'has_more': has_more,
+        })
     
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
 
+SSE_KEEPALIVE_SECONDS = 25
+SSE_RETRY_MS = 5000
+
+
+@login_required
+async def support_events(request):
+    """Server-Sent Events stream of support message changes (user's own, plus all for admins)"""
+    if not isinstance(request, ASGIRequest):
+        # A stream would pin a WSGI worker for as long as the tab is open;
+        # 204 tells EventSource not to reconnect, so pages keep working without it
+        return HttpResponse(status=204)
+    
+    user = await request.auser()
+    channels = [user_channel(user.pk)]
+    if user.is_superuser:
+        channels.append(ADMIN_CHANNEL)
+    
+    async def stream():
+        queue = hub.subscribe(channels)
+        try:
+            yield f'retry: {SSE_RETRY_MS}\n\n'
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ': keepalive\n\n'
+                    continue
+                yield f'event: message\ndata: {event}\n\n'
+        finally:
+            hub.unsubscribe(queue, channels)
+    
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 # ========================================
 # ADMIN MESSAGE MANAGEMENT VIEWS
 # ========================================
 
+def _admin_message_counts():
+    """Inbox header and filter counts; each is served by one of the message indexes"""
+    unresolved = SupportMessage.objects.filter(is_resolved=False)
+    counts = {
+        'all': SupportMessage.objects.count(),
+        'resolved': SupportMessage.objects.filter(is_resolved=True).count(),
+        'time_correction': unresolved.filter(message_type='time_correction').count(),
+        'bug_report': unresolved.filter(message_type='bug_report').count(),
+        'feedback': unresolved.filter(message_type='feedback').count(),
+    }
+    counts['pending'] = counts['all'] - counts['resolved']
+    return counts
+
+
 @login_required
 @superuser_required
 def admin_messages_view(request):
     """Admin view for managing support messages"""
-    # Get all support messages
-    all_messages = SupportMessage.objects.all().order_by('-created_at')
-    
-    # Unresolved messages
-    unresolved = all_messages.filter(is_resolved=False)
-    
-    # Group by message type
-    time_corrections = unresolved.filter(message_type='time_correction')
-    general_messages = unresolved.filter(message_type='general')
-    bug_reports = unresolved.filter(message_type='bug_report')
-    feedback = unresolved.filter(message_type='feedback')
-    
-    # Resolved messages
-    resolved = all_messages.filter(is_resolved=True)
-    
+    all_messages = list(SupportMessage.objects.select_related('sender', 'study_session').order_by('-created_at'))
     context = {
         'all_messages': all_messages,
-        'unresolved': unresolved,
-        'time_corrections': time_corrections,
-        'general_messages': general_messages,
-        'bug_reports': bug_reports,
-        'feedback': feedback,
-        'resolved': resolved,
-        'unresolved_count': unresolved.count(),
+        # The page's live updates fetch changes after this
+        'sync_cursor': SupportMessage.latest_cursor(all_messages),
+        'counts': _admin_message_counts(),
     }
     
     return render(request, 'core/admin_messages.html', context)
 
 
+@login_required
+@superuser_required
+def admin_message_changes(request):
+    """
+    Messages changed after the `since` cursor, rendered for the admin inbox,
+    with fresh header counts. Pass back `next_cursor` to keep syncing.
+    """
+    try:
+        since = request.GET.get('since')
+        try:
+            changed, has_more = SupportMessage.changed_since(None, since, limit=USER_MESSAGES_PAGE_SIZE)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+        
+        return JsonResponse({
+            'success': True,
+            'messages': [
+                {'id': msg.id, 'html': render_to_string('core/partials/admin_conversation.html', {'msg': msg})}
+                for msg in changed
+            ],
+            'counts': _admin_message_counts() if changed else None,
+            'next_cursor': changed[-1].cursor if changed else since,
+            'has_more': has_more,
+        })
+    
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
 @login_required
 @superuser_required
 @require_POST
@@ -1852,25 +1970,79 @@ def admin_approve_feedback(request):
 # ADMIN STUDY SESSION MANAGEMENT VIEWS
 # ========================================
 
+def _filter_study_sessions(request, sessions):
+    """Apply the admin sessions page filters (user, subject, date) from the query string"""
+    user_filter = request.GET.get('user')
+    subject_filter = request.GET.get('subject')
+    date_filter = request.GET.get('date')
+    
+    if user_filter:
+        sessions = sessions.filter(user__username__icontains=user_filter)
+    if subject_filter:
+        sessions = sessions.filter(subject__icontains=subject_filter)
+    if date_filter:
+        sessions = sessions.filter(date=date_filter)
+    return sessions
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output"""
+    def write(self, value):
+        return value
+
+
+# Columns in study session exports
+SESSION_EXPORT_FIELDS = ['id', 'user__username', 'subject', 'duration', 'date', 'created_at']
+SESSION_EXPORT_HEADER = ['id', 'username', 'subject', 'duration_minutes', 'date', 'created_at']
+SESSION_EXPORT_CHUNK_SIZE = 2000
+
+
+@login_required
+@superuser_required
+def admin_export_sessions(request):
+    """Stream all study sessions matching the page filters as CSV or NDJSON"""
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in ('csv', 'ndjson'):
+        return JsonResponse({'error': 'Format must be csv or ndjson'}, status=400)
+    
+    # Plain tuples straight from the cursor - no model instances, flat memory
+    rows = _filter_study_sessions(request, StudySession.objects.order_by('-date', '-id')).values_list(
+        *SESSION_EXPORT_FIELDS
+    ).iterator(chunk_size=SESSION_EXPORT_CHUNK_SIZE)
+    
+    stamp = timezone.now().strftime('%Y%m%d_%H%M')
+    if export_format == 'csv':
+        writer = csv.writer(_Echo())
+        
+        def stream():
+            yield writer.writerow(SESSION_EXPORT_HEADER)
+            for row in rows:
+                yield writer.writerow(row)
+        
+        response = StreamingHttpResponse(stream(), content_type='text/csv')
+    else:
+        def stream():
+            for row in rows:
+                yield json.dumps(dict(zip(SESSION_EXPORT_HEADER, row)), cls=DjangoJSONEncoder) + '\n'
+        
+        response = StreamingHttpResponse(stream(), content_type='application/x-ndjson')
+    
+    response['Content-Disposition'] = f'attachment; filename="FOCUS_Study_Sessions_{stamp}.{export_format}"'
+    return response
+
+
 @login_required
 @superuser_required
 def admin_study_sessions_view(request):
     """Admin view for managing all study sessions"""
     # Get all study sessions grouped by user
-    all_sessions = StudySession.objects.all().order_by('-date', '-created_at')
+    all_sessions = _filter_study_sessions(request, StudySession.objects.all().order_by('-date', '-created_at'))
     
     # Get filter parameters
     user_filter = request.GET.get('user')
     subject_filter = request.GET.get('subject')
     date_filter = request.GET.get('date')
     
-    if user_filter:
-        all_sessions = all_sessions.filter(user__username__icontains=user_filter)
-    if subject_filter:
-        all_sessions = all_sessions.filter(subject__icontains=subject_filter)
-    if date_filter:
-        all_sessions = all_sessions.filter(date=date_filter)
-    
     # Get all users and subjects for filters
     all_users = User.objects.all().order_by('username')
     all_subjects = StudySession.objects.values_list('subject', flat=True).distinct()
@@ -1887,6 +2059,37 @@ def admin_study_sessions_view(request):
     return render(request, 'core/admin_study_sessions.html', context)
 
 
+# Time ranges offered on the admin metrics page, in hours
+METRICS_WINDOWS = [1, 24, 168]
+
+
+@login_required
+@superuser_required
+def admin_metrics_view(request):
+    """Per-view request counts, latency and SQL usage collected by MetricsMiddleware"""
+    try:
+        hours = int(request.GET.get('hours', 24))
+    except ValueError:
+        hours = 24
+    if hours not in METRICS_WINDOWS:
+        hours = 24
+    
+    # Include this worker's unflushed samples; other workers catch up on their next flush
+    recorder.flush()
+    since = (timezone.now() - timedelta(hours=hours)).replace(minute=0, second=0, microsecond=0)
+    rows = summarize(RequestMetric.objects.filter(window_start__gte=since))
+    
+    context = {
+        'rows': rows,
+        'hours': hours,
+        'windows': METRICS_WINDOWS,
+        'total_requests': sum(row['requests'] for row in rows),
+        'total_errors': sum(row['errors'] for row in rows),
+        'metrics_enabled': settings.METRICS_ENABLED,
+    }
+    return render(request, 'core/admin_metrics.html', context)
+
+
 @login_required
 @superuser_required
 @require_POST
@@ -1901,14 +2104,18 @@ def admin_edit_session(request):
         if not session_id:
             return JsonResponse({'error': 'Session ID is required'}, status=400)
         
-        session = StudySession.objects.get(id=session_id)
-        
-        if new_duration is not None:
-            session.duration = int(new_duration)
-        if new_subject:
-            session.subject = new_subject
-        
-        session.save()
+        with transaction.atomic():
+            session = StudySession.objects.select_for_update().get(id=session_id)
+            old_duration = session.duration
+            
+            if new_duration is not None:
+                session.duration = int(new_duration)
+            if new_subject:
+                session.subject = new_subject
+            
+            session.save()
+            DailyStudyTotal.apply_delta(session.user, session.date, minutes=session.duration - old_duration)
+            bump_data_version(session.user, leaderboard=True)
         
         return JsonResponse({
             'success': True,
@@ -1933,11 +2140,14 @@ def admin_delete_session(request):
         if not session_id:
             return JsonResponse({'error': 'Session ID is required'}, status=400)
         
-        session = StudySession.objects.get(id=session_id)
-        username = session.user.username
-        subject = session.subject
-        duration = session.duration
-        session.delete()
+        with transaction.atomic():
+            session = StudySession.objects.select_for_update().select_related('user').get(id=session_id)
+            username = session.user.username
+            subject = session.subject
+            duration = session.duration
+            session.delete()
+            DailyStudyTotal.apply_delta(session.user, session.date, minutes=-duration, sessions=-1)
+            bump_data_version(session.user, leaderboard=True)
         
         return JsonResponse({
             'success': True,
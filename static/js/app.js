@@ -204,6 +204,105 @@ function showToast(message, type = 'info') {
     }, 3000);
 }
 
+// Live support message updates. Each change announced on the Server-Sent Events
+// stream is fetched from `changesUrl` with the `since` cursor (starting from the
+// container's data-cursor) and patched into `container`. Under WSGI the stream
+// answers 204, so the page polls for changes instead.
+const SUPPORT_POLL_MS = 30000;
+
+function watchSupportMessages({ eventsUrl, changesUrl, container, onPatched }) {
+    let since = container.dataset.cursor || '';
+    let running = false;
+    let pending = false;
+    let polling = null;
+
+    async function sync() {
+        // One sync at a time; a change announced meanwhile triggers one more
+        if (running) {
+            pending = true;
+            return;
+        }
+        running = true;
+        try {
+            let page;
+            do {
+                const query = since ? `?since=${encodeURIComponent(since)}` : '';
+                const response = await fetch(changesUrl + query);
+                if (!response.ok) return;
+                page = await response.json();
+                page.messages.forEach(message => patchSupportMessage(container, message));
+                since = page.next_cursor || since;
+                if (page.messages.length && onPatched) onPatched(page);
+            } while (page.has_more);
+        } catch (error) {
+            console.error('Support sync failed:', error);
+        } finally {
+            running = false;
+            if (pending) {
+                pending = false;
+                sync();
+            }
+        }
+    }
+
+    function startPolling() {
+        if (polling) return;
+        polling = setInterval(() => {
+            if (!document.hidden) sync();
+        }, SUPPORT_POLL_MS);
+        document.addEventListener('visibilitychange', () => {
+            if (!document.hidden) sync();
+        });
+    }
+
+    if ('EventSource' in window) {
+        const source = new EventSource(eventsUrl);
+        const queueSync = debounce(sync, 300);
+        // Also catches up on anything missed before (re)connecting
+        source.addEventListener('open', queueSync);
+        source.addEventListener('message', (event) => {
+            const change = JSON.parse(event.data);
+            if (change.action === 'deleted') {
+                container.querySelector(`[data-message-id="${change.id}"]`)?.remove();
+            } else {
+                queueSync();
+            }
+        });
+        source.addEventListener('error', () => {
+            // A 204 (WSGI) or a failed response closes the stream for good
+            if (source.readyState === EventSource.CLOSED) startPolling();
+        });
+    } else {
+        startPolling();
+    }
+
+    return { sync };
+}
+
+function patchSupportMessage(container, message) {
+    const template = document.createElement('template');
+    template.innerHTML = message.html.trim();
+    const fresh = template.content.firstElementChild;
+    const current = container.querySelector(`[data-message-id="${message.id}"]`);
+
+    if (current) {
+        // Keep whatever was typed into the old copy, e.g. a half-written reply
+        current.querySelectorAll('textarea[id], input[id]').forEach(field => {
+            const copy = fresh.querySelector(`#${field.id}`);
+            if (!copy) return;
+            if (field.type === 'checkbox') {
+                copy.checked = field.checked;
+            } else {
+                copy.value = field.value;
+            }
+        });
+        current.replaceWith(fresh);
+    } else {
+        container.querySelector('[data-empty-state]')?.remove();
+        container.appendChild(fresh);
+    }
+}
+
 // Add CSS for toast animations
 const style = document.createElement('style');
 style.textContent = `
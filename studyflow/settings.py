@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,6 +44,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.metrics.MetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -80,9 +82,57 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse each worker's connection instead of reopening it for every request
+        'CONN_MAX_AGE': int(os.environ.get('FOCUS_DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Take the write lock when a transaction starts; upgrading a read lock
+            # later fails immediately with "database is locked" despite busy_timeout
+            'transaction_mode': os.environ.get('FOCUS_SQLITE_TRANSACTION_MODE', 'IMMEDIATE'),
+        },
     }
 }
 
+# Same file opened for reading only; the async dashboard views run their independent
+# queries concurrently on this alias (core.reads). Tests reuse the default database.
+DATABASES['readonly'] = {
+    **DATABASES['default'],
+    'OPTIONS': {'init_command': 'PRAGMA query_only = ON'},
+    'TEST': {'MIRROR': 'default'},
+}
+DATABASE_ROUTERS = ['core.reads.ReadRouter']
+
+# Pool threads (one read-only connection each) shared by all concurrent reads in a worker;
+# 0 runs the reads one after another, which is as fast on a single CPU core
+CONCURRENT_READ_WORKERS = int(os.environ.get('FOCUS_CONCURRENT_READ_WORKERS', 8))
+
+# Applied to every new SQLite connection (core.signals.configure_sqlite). WAL lets
+# readers run alongside a writer, and busy_timeout makes writers queue rather than fail.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('FOCUS_SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.environ.get('FOCUS_SQLITE_SYNCHRONOUS', 'normal'),
+    'busy_timeout': int(os.environ.get('FOCUS_SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    # Negative sizes are KiB: 20 MB of page cache per connection
+    'cache_size': int(os.environ.get('FOCUS_SQLITE_CACHE_SIZE', -20000)),
+    'mmap_size': int(os.environ.get('FOCUS_SQLITE_MMAP_SIZE', 128 * 1024 * 1024)),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory is per process: with several workers, point this at a shared
+# backend (e.g. Redis or file based) so data version bumps reach every worker.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('FOCUS_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('FOCUS_CACHE_LOCATION', 'focus-default'),
+    }
+}
+
+# Seconds a computed dashboard payload may stay cached (it is also versioned per user)
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get('FOCUS_DASHBOARD_CACHE_TIMEOUT', 600))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -126,7 +176,34 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Spawn a local worker process when an admin report is queued
+# (disable when `manage.py run_report_worker` runs as a service)
+REPORT_WORKER_AUTOSTART = os.environ.get('FOCUS_REPORT_WORKER_AUTOSTART', '1') == '1'
+
+# Fan-out for live support message events (core.events). The default only reaches
+# SSE clients connected to the same process.
+EVENT_BROKER = os.environ.get('FOCUS_EVENT_BROKER', 'core.events.LocalBroker')
+
+# Per-view request metrics (core.metrics), shown at /admin-panel/metrics/. Each worker
+# buffers samples in memory and writes them to the database every METRICS_FLUSH_SECONDS
+# or once METRICS_BUFFER_SIZE samples are waiting.
+METRICS_ENABLED = os.environ.get('FOCUS_METRICS_ENABLED', '1') == '1'
+METRICS_FLUSH_SECONDS = int(os.environ.get('FOCUS_METRICS_FLUSH_SECONDS', '60'))
+METRICS_BUFFER_SIZE = int(os.environ.get('FOCUS_METRICS_BUFFER_SIZE', '2048'))
+
+# Sessions: 'django.contrib.sessions.backends.cached_db' reads from the cache and
+# only falls back to the database on a miss; 'django.contrib.sessions.backends.signed_cookies'
+# needs no server storage at all, but sessions can't be revoked server-side
+SESSION_ENGINE = os.environ.get('FOCUS_SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db')
+
 # Authentication settings
+AUTHENTICATION_BACKENDS = [
+    # Serves request.user from the cache (core.auth)
+    'core.auth.CachedModelBackend',
+    # Sessions created before the cached backend still name this one
+    'django.contrib.auth.backends.ModelBackend',
+]
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get('FOCUS_AUTH_USER_CACHE_TIMEOUT', 300))
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'dashboard'
 LOGOUT_REDIRECT_URL = 'login'